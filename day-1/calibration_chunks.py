@@ -0,0 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, List, Optional, Tuple
+import mmap
+import os
+
+# Default number of bytes handed to each worker by calibrate_file_parallel
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def find_chunk_boundaries(file_path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    # Splits the file into (start, end) byte ranges that always end on a line break
+    file_size = os.path.getsize(file_path)
+    boundaries = []
+    with open(file_path, "rb") as f:
+        start = 0
+        while start < file_size:
+            f.seek(min(start + chunk_size, file_size))
+            # Finish the line straddling the boundary so it stays in this chunk
+            f.readline()
+            end = f.tell()
+            boundaries.append((start, end))
+            start = end
+
+    return boundaries
+
+
+def calibrate_chunk(calibrate_line: Callable[[bytes], int], file_path: str, start: int, end: int) -> int:
+    # Streams the lines in [start, end) through a memory map, one raw byte line at a time
+    total_calibration_value = 0
+    if start >= end:
+        return total_calibration_value
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.seek(start)
+        while mm.tell() < end:
+            total_calibration_value += calibrate_line(mm.readline())
+
+    return total_calibration_value
+
+
+def calibrate_file_parallel(
+    calibrate_line: Callable[[bytes], int],
+    file_path: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    # Sums line aligned chunks in a process pool, workers=None uses every core.
+    # calibrate_line must be a module level function so the pool can pickle it.
+    chunks = find_chunk_boundaries(file_path, chunk_size)
+    starts = [start for start, _ in chunks]
+    ends = [end for _, end in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(calibrate_chunk, repeat(calibrate_line), repeat(file_path), starts, ends))
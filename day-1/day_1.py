@@ -1,5 +1,11 @@
-from typing import List
+from typing import List, Optional
 import os
+import tempfile
+
+import numpy as np
+
+import calibration_chunks
+from calibration_chunks import DEFAULT_CHUNK_SIZE, calibrate_chunk
 
 example_data = {
     "1abc2": 12,
@@ -13,6 +19,10 @@ def test_example_data():
 
     assert total_calibration_value == 142
 
+def test_numpy_engine():
+    lines = list(example_data.keys()) + ["no digits", "", "x9"]
+    assert calibrate_text(lines, engine="numpy") == calibrate_text(lines) == 241
+
 def calibrate_line(line: str):
     first_integer = None
     last_integer = None
@@ -32,7 +42,44 @@ def calibrate_line(line: str):
         return 0  # Return 0 if no integers are found in the string
 
 
-def calibrate_text(calibration_lines: List[str]):
+# Every byte except the ASCII digits, for stripping a raw line down to its digits
+NON_DIGIT_BYTES = bytes(byte for byte in range(256) if not ord("0") <= byte <= ord("9"))
+
+def calibrate_line_bytes(line: bytes):
+    digits = line.translate(None, NON_DIGIT_BYTES)
+    if not digits:
+        return 0  # Return 0 if no integers are found in the line
+
+    return (digits[0] - ord("0")) * 10 + digits[-1] - ord("0")
+
+
+def calibrate_array(data: np.ndarray) -> int:
+    # Vectorized engine over a uint8 document, no Python loop per character
+    digit_positions = np.flatnonzero((data >= ord("0")) & (data <= ord("9")))
+    if len(digit_positions) == 0:
+        return 0
+
+    # Line number of every digit is the count of newlines before it
+    newline_positions = np.flatnonzero(data == ord("\n"))
+    digit_lines = np.searchsorted(newline_positions, digit_positions)
+
+    # Lines without digits never show up here, so they add 0 as before
+    line_changes = digit_lines[1:] != digit_lines[:-1]
+    first_digits = data[digit_positions[np.concatenate(([True], line_changes))]]
+    last_digits = data[digit_positions[np.concatenate((line_changes, [True]))]]
+
+    return int(
+        (first_digits.astype(np.int64) - ord("0")).sum() * 10
+        + (last_digits.astype(np.int64) - ord("0")).sum()
+    )
+
+
+def calibrate_text(calibration_lines: List[str], engine: str = "python"):
+    if engine == "numpy":
+        document = "\n".join(calibration_lines).encode()
+        return calibrate_array(np.frombuffer(document, dtype=np.uint8))
+
+    assert engine == "python"
     total_calibration_value = 0
     for line in calibration_lines:
         calibration_value = calibrate_line(line)
@@ -40,8 +87,33 @@ def calibrate_text(calibration_lines: List[str]):
 
     return total_calibration_value
 
+def calibrate_file(file_path: str, engine: str = "python") -> int:
+    if os.path.getsize(file_path) == 0:
+        return 0
+
+    if engine == "numpy":
+        return calibrate_array(np.memmap(file_path, dtype=np.uint8, mode="r"))
+
+    assert engine == "python"
+    return calibrate_chunk(calibrate_line_bytes, file_path, 0, os.path.getsize(file_path))
+
+def calibrate_file_parallel(file_path: str, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    return calibration_chunks.calibrate_file_parallel(calibrate_line_bytes, file_path, workers, chunk_size)
+
+def test_calibrate_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "calibrationdoc.txt")
+        with open(file_path, "w") as f:
+            f.write("\n".join(example_data.keys()))
+
+        assert calibrate_file_parallel(file_path, workers=2, chunk_size=8) == calibrate_file(file_path)
+        assert calibrate_file(file_path) == 142
+        assert calibrate_file(file_path, engine="numpy") == 142
+
 if __name__ == "__main__":
     test_example_data()
+    test_numpy_engine()
+    test_calibrate_file()
 
     py_file_path = os.path.dirname(__file__)
     calibration_doc_path = os.path.join(py_file_path, "calibrationdoc.txt")
@@ -57,3 +129,7 @@ if __name__ == "__main__":
     calibration_value = calibrate_text(calibration_lines)
 
     print(calibration_value)
+
+    assert calibrate_file(calibration_doc_path) == calibration_value
+    assert calibrate_file_parallel(calibration_doc_path) == calibration_value
+    assert calibrate_file(calibration_doc_path, engine="numpy") == calibration_value
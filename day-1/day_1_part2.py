@@ -1,6 +1,11 @@
 
-from typing import List
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 import os
+import tempfile
+
+import calibration_chunks
+from calibration_chunks import DEFAULT_CHUNK_SIZE, calibrate_chunk
 
 example_data = [
     "two1nine",
@@ -12,44 +17,85 @@ example_data = [
     "7pqrstsixteen"
 ]
 
-def calibrate_line_part2(line: str):
-    def text_to_number(text):
-        mapping = {
-            "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-            "six": 6, "seven": 7, "eight": 8, "nine": 9
-        }
-        return mapping.get(text.lower())
-
-    def find_number_from_index(s, index):
-        current_text = ""
-        for char in s[index:]:
-            current_text += char
-            number = text_to_number(current_text)
-            if number is not None:
-                return number
-        return None
-    
-    first_integer = None
-    last_integer = None
-
-    for i in range(len(line)):
-        if line[i].isalpha():
-            number = find_number_from_index(line, i)
-            if number is not None:
-                if first_integer is None:
-                    first_integer = number
-                last_integer = number
-        elif line[i].isdigit():
-            if first_integer is None:
-                first_integer = int(line[i])
-            last_integer = int(line[i])
-
-    # Combine the integers if both are found
-    if first_integer is not None and last_integer is not None:
-        return int(f"{first_integer}{last_integer}")
-    else:
+DIGIT_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9,
+}
+DIGIT_WORDS.update({str(digit): digit for digit in range(10)})
+
+
+class DigitAutomaton:
+    """Aho-Corasick style matcher that finds digit words in a single pass.
+
+    The trie and its failure links are folded into a complete transition
+    table when the automaton is built, so scanning costs one dict lookup per
+    character and overlapping words like "eightwo" are all reported.
+    """
+
+    def __init__(self, words: Dict[str, int]) -> None:
+        children: List[Dict[str, int]] = [{}]
+        self.outputs: List[Optional[int]] = [None]
+
+        for word, value in words.items():
+            state = 0
+            for char in word:
+                if char not in children[state]:
+                    children.append({})
+                    self.outputs.append(None)
+                    children[state][char] = len(children) - 1
+                state = children[state][char]
+            self.outputs[state] = value
+
+        # Accept both cases like the old text.lower(), and raw bytes as well as str
+        self.transitions: List[Dict[Union[str, int], int]] = [{} for _ in children]
+        for state, node in enumerate(children):
+            for char, next_state in node.items():
+                for key in (char, char.upper(), ord(char), ord(char.upper())):
+                    self.transitions[state][key] = next_state
+
+        # Walk the trie breadth first so every failure target is already complete
+        fail = [0] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = self.transitions[fail[state]]
+            if self.outputs[state] is None:
+                self.outputs[state] = self.outputs[fail[state]]
+            for char, next_state in children[state].items():
+                fail[next_state] = fallback.get(char, 0)
+                queue.append(next_state)
+            for key, next_state in fallback.items():
+                self.transitions[state].setdefault(key, next_state)
+
+    def scan(self, text: Iterable[Union[str, int]]) -> Iterator[int]:
+        # Yields the value of every word in text, ordered by end position
+        transitions = self.transitions
+        outputs = self.outputs
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            value = outputs[state]
+            if value is not None:
+                yield value
+
+    def first(self, text: Iterable[Union[str, int]]) -> Optional[int]:
+        return next(self.scan(text), None)
+
+
+FORWARD_DIGITS = DigitAutomaton(DIGIT_WORDS)
+# Matches the reversed words so the last digit can be found from the right end
+BACKWARD_DIGITS = DigitAutomaton({word[::-1]: value for word, value in DIGIT_WORDS.items()})
+
+
+def calibrate_line_part2(line: Union[str, bytes]):
+    first_integer = FORWARD_DIGITS.first(line)
+    if first_integer is None:
         return 0  # Return 0 if no integers are found in the string
 
+    last_integer = BACKWARD_DIGITS.first(reversed(line))
+
+    return first_integer * 10 + last_integer
+
 
 def calibrate_text(calibration_lines: List[str]):
     total_calibration_value = 0
@@ -59,14 +105,35 @@ def calibrate_text(calibration_lines: List[str]):
 
     return total_calibration_value
 
+def calibrate_file(file_path: str) -> int:
+    return calibrate_chunk(calibrate_line_part2, file_path, 0, os.path.getsize(file_path))
+
+def calibrate_file_parallel(file_path: str, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    return calibration_chunks.calibrate_file_parallel(calibrate_line_part2, file_path, workers, chunk_size)
+
 def test_example_data_part2():
     calibration_value = calibrate_text(example_data)
     assert calibration_value == 281
 
+def test_calibrate_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "calibrationdoc.txt")
+        with open(file_path, "w") as f:
+            f.write("\n".join(example_data))
+
+        assert calibrate_file_parallel(file_path, workers=2, chunk_size=8) == calibrate_file(file_path)
+        assert calibrate_file(file_path) == calibrate_text(example_data)
+
+def test_overlapping_words():
+    assert list(FORWARD_DIGITS.scan("eightwo3oneight")) == [8, 2, 3, 1, 8]
+    assert calibrate_line_part2("eightwo") == 82
+    assert calibrate_line_part2("xyz") == 0
 
 
 if __name__ == "__main__":
     test_example_data_part2()
+    test_overlapping_words()
+    test_calibrate_file()
 
     py_file_path = os.path.dirname(__file__)
     calibration_doc_path = os.path.join(py_file_path, "calibrationdoc.txt")
@@ -81,4 +148,7 @@ if __name__ == "__main__":
 
     calibration_value = calibrate_text(calibration_lines)
 
-    print(calibration_value)
\ No newline at end of file
+    print(calibration_value)
+
+    assert calibrate_file(calibration_doc_path) == calibration_value
+    assert calibrate_file_parallel(calibration_doc_path) == calibration_value
\ No newline at end of file
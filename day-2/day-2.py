@@ -1,5 +1,10 @@
 import os
-from typing import List
+import sys
+import tempfile
+from typing import List, Tuple, Union
+
+from game_log_tail import GameLogTail
+from game_store import GameStore, parse_game
 
 def get_game_id(game: str) -> int:
     # Split the string by spaces and grab the second element (index 1)
@@ -13,11 +18,12 @@ def get_game_id(game: str) -> int:
     else:
         return -1
 
-def game_is_possible(game: str) -> bool:
-    REDS = 12
-    GREENS = 13
-    BLUES = 14
+# Bag contents asked about by the puzzle
+REDS = 12
+GREENS = 13
+BLUES = 14
 
+def game_is_possible(game: str, reds: int = REDS, greens: int = GREENS, blues: int = BLUES) -> bool:
     # Split the game string into sets
     sets = game.split(';')
     
@@ -48,15 +54,22 @@ def game_is_possible(game: str) -> bool:
         max_blues = max(max_blues, current_blues)
 
     # Check if the game is possible with the available cubes
-    return max_reds <= REDS and max_greens <= GREENS and max_blues <= BLUES
+    return max_reds <= reds and max_greens <= greens and max_blues <= blues
+
+def sum_ids_possible_games(game_list: Union[List[str], GameStore]) -> int:
+    # Accepts an already parsed GameStore so part 2 can reuse the same parse
+    if not isinstance(game_list, GameStore):
+        game_list = GameStore.from_lines(game_list)
+
+    return game_list.sum_ids_possible(REDS, GREENS, BLUES)
+
 
-def sum_ids_possible_games(game_list: List[str]) -> int:
-    result = 0
-    for game in game_list:
-        if (game_is_possible(game)):
-            result += get_game_id(game)
+def sum_ids_possible_games_batch(game_list: Union[List[str], GameStore], limits: List[Tuple[int, int, int]]) -> List[int]:
+    # Answers many (reds, greens, blues) bag configurations against one parse
+    if not isinstance(game_list, GameStore):
+        game_list = GameStore.from_lines(game_list)
 
-    return result
+    return game_list.sum_ids_possible_batch(limits).tolist()
 
 def test_example_data():
     example_data = [
@@ -70,11 +83,82 @@ def test_example_data():
     result = sum_ids_possible_games(example_data)
 
     assert result == 8
+    assert result == sum(get_game_id(game) for game in example_data if game_is_possible(game))
+
+    limits = [(12, 13, 14), (0, 0, 0), (20, 13, 15), (4, 3, 6), (100, 100, 100)]
+    expected = [
+        sum(get_game_id(game) for game in example_data if game_is_possible(game, *limit))
+        for limit in limits
+    ]
+    assert sum_ids_possible_games_batch(example_data, limits) == expected == [8, 0, 15, 3, 15]
+
+    # Holding on to the columns must not block appending more games
+    store = GameStore.from_lines(example_data[:3])
+    ids, _, _, _ = store.columns()
+    store.add_game(example_data[3])
+    store.add_game(example_data[4])
+    assert ids.tolist() == [1, 2, 3]
+    assert store.sum_ids_possible(REDS, GREENS, BLUES) == 8
+
+    # Colors in any case, empty sets and games without cubes parse like they always did
+    assert parse_game("Game 1: 3 Blue, 4 red") == (1, 4, 0, 3)
+    assert parse_game("Game 3: 1 red;") == (3, 1, 0, 0)
+    assert parse_game("Game 2:") == (2, 0, 0, 0)
+    assert parse_game("   ") is None
+    assert sum_ids_possible_games(["Game 2:", "", "Game 3: 1 RED;"]) == 5
+
+
+def test_log_tail():
+    example_data = [
+        "Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n",
+        "Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue\n",
+        "Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red\n",
+        "Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red\n",
+        "Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green\n",
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, "puzzle_input.txt")
+        checkpoint_path = os.path.join(temp_dir, "checkpoint.json")
+
+        with open(log_path, "w") as f:
+            f.writelines(example_data[:2])
+            # An unfinished line is left for the next poll
+            f.write(example_data[2][:10])
+
+        tail = GameLogTail(log_path, (REDS, GREENS, BLUES), checkpoint_path)
+        assert tail.poll() == 2
+        assert tail.sum_possible_ids == 3
+
+        with open(log_path, "a") as f:
+            f.write(example_data[2][10:])
+            f.writelines(example_data[3:])
+
+        # A fresh tail resumes from the checkpoint and only parses the new games
+        tail = GameLogTail(log_path, (REDS, GREENS, BLUES), checkpoint_path)
+        assert tail.poll() == 3
+        assert tail.sum_possible_ids == 8
+        assert tail.sum_of_powers == 2286
+
+        # A checkpoint taken with other limits is not resumed
+        tail = GameLogTail(log_path, (0, 0, 0), checkpoint_path)
+        assert tail.poll() == 5
+        assert tail.sum_possible_ids == 0
+        assert tail.sum_of_powers == 2286
+
+        # Neither is one of a log that was replaced by another at least as long
+        rotated_path = os.path.join(temp_dir, "rotated.txt")
+        with open(rotated_path, "w") as f:
+            f.writelines(reversed(example_data))
+        os.replace(rotated_path, log_path)
+        tail = GameLogTail(log_path, (0, 0, 0), checkpoint_path)
+        assert tail.poll() == 5
+        assert tail.sum_of_powers == 2286
 
-    
 
 if __name__ == "__main__":
     test_example_data()
+    test_log_tail()
 
     
     py_file_path = os.path.dirname(__file__)
@@ -82,6 +166,13 @@ if __name__ == "__main__":
 
     assert(os.path.exists(puzzle_doc_path))
 
+    if "--follow" in sys.argv:
+        # Keep both answers current while the log grows
+        checkpoint_path = os.path.join(py_file_path, "puzzle_input.checkpoint.json")
+        tail = GameLogTail(puzzle_doc_path, (REDS, GREENS, BLUES), checkpoint_path)
+        for sum_possible_ids, sum_of_powers in tail.follow():
+            print(sum_possible_ids, sum_of_powers, flush=True)
+
     puzzle_lines = []
     with open(puzzle_doc_path) as f:
         puzzle_lines = f.readlines()
@@ -1,5 +1,7 @@
 import os
-from typing import List, Tuple
+from typing import List, Tuple, Union
+
+from game_store import GameStore
 
 def minimum_necessary_balls(game: str) -> Tuple[int, int, int]:
     # Split the game string into sets
@@ -33,13 +35,12 @@ def minimum_necessary_balls(game: str) -> Tuple[int, int, int]:
     return min_reds, min_greens, min_blues
 
 
-def product_of_minimum_balls(game_list: List[str]) -> int:
-    result = 0
-    for game in game_list:
-        red, green, blue = minimum_necessary_balls(game)
-        result += red * green * blue
+def product_of_minimum_balls(game_list: Union[List[str], GameStore]) -> int:
+    # Accepts an already parsed GameStore so part 1 can reuse the same parse
+    if not isinstance(game_list, GameStore):
+        game_list = GameStore.from_lines(game_list)
 
-    return result
+    return game_list.sum_of_powers()
 
 def test_example_data():
     example_data = [
@@ -53,6 +54,7 @@ def test_example_data():
     result = product_of_minimum_balls(example_data)
 
     assert result == 2286
+    assert result == product_of_minimum_balls(GameStore.from_lines(example_data))
 
     
 
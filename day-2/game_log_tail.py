@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from game_store import parse_game
+
+
+class GameLogTail:
+    """Keeps both day 2 answers current for an append-only game log.
+
+    Only lines appended since the last poll are parsed. The byte offset and
+    running totals are written to an optional JSON checkpoint after every
+    poll, so a restarted tail carries on where it stopped. The checkpoint
+    also records the limits and the identity of the log file (its inode and
+    a hash of its first line), so a checkpoint taken with other limits or of
+    a since replaced log is not resumed.
+    """
+
+    def __init__(self, log_path: str, limits: Tuple[int, int, int], checkpoint_path: Optional[str] = None) -> None:
+        self.log_path = log_path
+        self.limits = limits
+        self.checkpoint_path = checkpoint_path
+        self.offset = 0
+        self.sum_possible_ids = 0
+        self.sum_of_powers = 0
+        # [inode, first line hash] of the log being read, None until a line was read
+        self.identity: Optional[List] = None
+
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            self.load_checkpoint()
+
+    def load_checkpoint(self) -> None:
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get("limits") != list(self.limits):
+            return  # the totals were counted against other limits, start over
+
+        self.identity = checkpoint["identity"]
+        self.offset = checkpoint["offset"]
+        self.sum_possible_ids = checkpoint["sum_possible_ids"]
+        self.sum_of_powers = checkpoint["sum_of_powers"]
+
+    def save_checkpoint(self) -> None:
+        checkpoint = {
+            "limits": list(self.limits),
+            "identity": self.identity,
+            "offset": self.offset,
+            "sum_possible_ids": self.sum_possible_ids,
+            "sum_of_powers": self.sum_of_powers,
+        }
+
+        # Write to a side file first so a crash never leaves half a checkpoint
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def file_identity(self) -> List:
+        with open(self.log_path, "rb") as f:
+            first_line = f.readline()
+            return [os.fstat(f.fileno()).st_ino, hashlib.sha1(first_line).hexdigest()]
+
+    def poll(self) -> int:
+        # Parses complete lines appended since the last poll, returns how many games were added
+        if self.offset and (os.path.getsize(self.log_path) < self.offset or self.file_identity() != self.identity):
+            # The log was truncated or replaced, start counting again
+            self.offset = 0
+            self.sum_possible_ids = 0
+            self.sum_of_powers = 0
+            self.identity = None
+
+        reds, greens, blues = self.limits
+        new_games = 0
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # the writer is still in the middle of this line
+
+                self.offset += len(line)
+                parsed = parse_game(line.decode())
+                if parsed is None:
+                    continue
+
+                game_id, max_reds, max_greens, max_blues = parsed
+                if max_reds <= reds and max_greens <= greens and max_blues <= blues:
+                    self.sum_possible_ids += game_id
+                self.sum_of_powers += max_reds * max_greens * max_blues
+                new_games += 1
+
+        if self.identity is None and self.offset:
+            # The first line is complete now, remember which file it belongs to
+            self.identity = self.file_identity()
+
+        if self.checkpoint_path is not None:
+            self.save_checkpoint()
+
+        return new_games
+
+    def follow(self, interval: float = 1.0) -> Iterator[Tuple[int, int]]:
+        # Yields (sum of possible ids, sum of powers) whenever new games arrive
+        while True:
+            if self.poll():
+                yield self.sum_possible_ids, self.sum_of_powers
+            time.sleep(interval)
@@ -0,0 +1,128 @@
+from array import array
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+COLOR_INDICES = {"red": 0, "green": 1, "blue": 2}
+
+
+def parse_game(game: str) -> Optional[Tuple[int, int, int, int]]:
+    # Returns (id, max reds, max greens, max blues), or None for a blank line
+    if not game.strip():
+        return None
+
+    header, _, sets = game.partition(":")
+    maxima = [0, 0, 0]
+    for set in sets.split(";"):
+        # Initialize counts for the current set
+        current = [0, 0, 0]
+        for cubes in set.split(","):
+            # Empty sets and cube lists, as in "Game 3: 1 red;", show no cubes
+            if not cubes.strip():
+                continue
+            number, color = cubes.split()
+            current[COLOR_INDICES[color.lower()]] += int(number)
+
+        for i in range(3):
+            maxima[i] = max(maxima[i], current[i])
+
+    return int(header.split()[1]), maxima[0], maxima[1], maxima[2]
+
+
+class GameStore:
+    """Columnar view of a game log, parsed once and shared by both parts.
+
+    Every game becomes one row across four parallel arrays: its id and the
+    largest number of red, green and blue cubes shown in any single set.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.max_reds = array("q")
+        self.max_greens = array("q")
+        self.max_blues = array("q")
+        self._columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        self._dominance_index: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_lines(cls, game_list: Iterable[str]) -> "GameStore":
+        store = cls()
+        for game in game_list:
+            store.add_game(game)
+        return store
+
+    def add_game(self, game: str) -> None:
+        parsed = parse_game(game)
+        if parsed is None:
+            return
+
+        self._columns = None
+        self._dominance_index = None
+        game_id, max_reds, max_greens, max_blues = parsed
+        self.ids.append(game_id)
+        self.max_reds.append(max_reds)
+        self.max_greens.append(max_greens)
+        self.max_blues.append(max_blues)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # NumPy copies of the id and max red/green/blue arrays, built once per batch of
+        # added games. A view would pin the array buffers and make add_game fail.
+        if self._columns is None:
+            self._columns = tuple(
+                np.array(column, dtype=np.int64)
+                for column in (self.ids, self.max_reds, self.max_greens, self.max_blues)
+            )
+        return self._columns
+
+    def sum_ids_possible(self, reds: int, greens: int, blues: int) -> int:
+        ids, max_reds, max_greens, max_blues = self.columns()
+        possible = (max_reds <= reds) & (max_greens <= greens) & (max_blues <= blues)
+        return int(ids[possible].sum())
+
+    def sum_of_powers(self) -> int:
+        _, max_reds, max_greens, max_blues = self.columns()
+        return int((max_reds * max_greens * max_blues).sum())
+
+    def dominance_index(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Sorted distinct maxima per color plus a 3D prefix sum of game ids.
+
+        Cell (r, g, b) of the table holds the sum of ids of every game whose
+        maxima are at most the r-th, g-th and b-th distinct red, green and blue
+        values. Cube counts are small, so the table stays small as well.
+        """
+        if self._dominance_index is None:
+            ids, max_reds, max_greens, max_blues = self.columns()
+            red_values, red_ranks = np.unique(max_reds, return_inverse=True)
+            green_values, green_ranks = np.unique(max_greens, return_inverse=True)
+            blue_values, blue_ranks = np.unique(max_blues, return_inverse=True)
+
+            table = np.zeros((len(red_values), len(green_values), len(blue_values)), dtype=np.int64)
+            np.add.at(table, (red_ranks, green_ranks, blue_ranks), ids)
+            for axis in range(3):
+                np.cumsum(table, axis=axis, out=table)
+
+            self._dominance_index = (red_values, green_values, blue_values, table)
+
+        return self._dominance_index
+
+    def sum_ids_possible_batch(self, limits) -> np.ndarray:
+        # limits is an (n, 3) array of (reds, greens, blues) bag contents
+        limits = np.asarray(limits, dtype=np.int64).reshape(-1, 3)
+        red_values, green_values, blue_values, table = self.dominance_index()
+
+        red_ranks = np.searchsorted(red_values, limits[:, 0], side="right") - 1
+        green_ranks = np.searchsorted(green_values, limits[:, 1], side="right") - 1
+        blue_ranks = np.searchsorted(blue_values, limits[:, 2], side="right") - 1
+
+        # A limit below every game's maximum on any color admits no games
+        any_possible = (red_ranks >= 0) & (green_ranks >= 0) & (blue_ranks >= 0)
+        result = np.zeros(len(limits), dtype=np.int64)
+        if table.size:
+            result[any_possible] = table[
+                red_ranks[any_possible], green_ranks[any_possible], blue_ranks[any_possible]
+            ]
+
+        return result
@@ -0,0 +1,287 @@
+from collections import deque
+from math import lcm
+from typing import Callable, Dict, List, Tuple
+
+# Pulses are plain ints: (edge id << 1) | pulse bit
+LOW = 0
+HIGH = 1
+
+# Module kinds, matching BaseModule.module_type
+OTHER = 0
+FLIPFLOP = 1
+CONJUNCTION = 2
+BROADCASTER = 3
+
+# Set on the kind of a module with probed incoming edges, so other pulses skip the probe lookup
+PROBED = 4
+
+# Fingerprints kept while looking for a repeat, a few hundred bytes each on a puzzle input
+DEFAULT_MAX_HISTORY = 100000
+
+MODULE_KINDS = {"flipflop": FLIPFLOP, "conjunction": CONJUNCTION, "broadcaster": BROADCASTER}
+
+
+class CompiledPulseEngine:
+    """Integer-indexed version of PulseManager for long simulations.
+
+    A ModuleConfiguration is compiled once into module ids, edge ids and flat
+    state lists. A pulse is a single int on a deque, every module keeps a
+    precomputed list of the low and high pulses it sends, and every
+    conjunction keeps a count of inputs that last sent HIGH instead of
+    checking all of them on each pulse. The compiled engine starts from the
+    current module states and then keeps its own, so it does not update the
+    module objects.
+    """
+
+    def __init__(self, module_config) -> None:
+        modules = module_config.modules
+        self.names: List[str] = list(modules)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.kinds: List[int] = [MODULE_KINDS.get(modules[name].module_type, OTHER) for name in self.names]
+
+        # Edge e goes from edge_sources[e] to edge_destinations[e]
+        self.edge_sources: List[int] = []
+        self.edge_destinations: List[int] = []
+        # Conjunctions remember one pulse per input module, so repeated edges share a slot
+        self.edge_slots: List[int] = []
+        self.slot_ids: Dict[Tuple[int, int], int] = {}
+        self.low_pulses: List[List[int]] = []
+        self.high_pulses: List[List[int]] = []
+        for source, name in enumerate(self.names):
+            edges = []
+            for dest in modules[name].destinations:
+                destination = self.index[dest.module_name]
+                edge = len(self.edge_sources)
+                self.edge_sources.append(source)
+                self.edge_destinations.append(destination)
+                self.edge_slots.append(self.slot_ids.setdefault((source, destination), len(self.slot_ids)))
+                edges.append(edge)
+            self.low_pulses.append([edge << 1 | LOW for edge in edges])
+            self.high_pulses.append([edge << 1 | HIGH for edge in edges])
+
+        self.flipflop_states = bytearray(len(self.names))
+        # Conjunction memory is one bit per input slot, plus a running count of HIGH inputs
+        self.slot_memory = bytearray(len(self.slot_ids))
+        self.input_counts = [0] * len(self.names)
+        self.high_inputs = [0] * len(self.names)
+        for _, destination in self.slot_ids:
+            self.input_counts[destination] += 1
+
+        for i, name in enumerate(self.names):
+            module = modules[name]
+            if self.kinds[i] == FLIPFLOP:
+                self.flipflop_states[i] = module.state.value
+            elif self.kinds[i] == CONJUNCTION:
+                for input_name, pulse_type in module.states.items():
+                    if pulse_type.value == "high":
+                        self.slot_memory[self.slot_ids[self.index[input_name], i]] = HIGH
+                        self.high_inputs[i] += 1
+
+        self.button_pulse = self.low_pulses[self.index["button"]][0]
+        self.rx = self.index.get("rx", -1)
+        # Pulse value -> callbacks taking the button press count
+        self.probes: Dict[int, List[Callable[[int], None]]] = {}
+        self.queue: deque = deque()
+        self.low_pulse_count = 0
+        self.high_pulse_count = 0
+        self.button_presses = 0
+        self.rx_received_low = False
+        self.rx_received_low_button_count = 0
+
+    def add_probe(self, source: str, destination: str, pulse_type: int, callback: Callable[[int], None]) -> None:
+        # Calls callback(button_presses) whenever source sends pulse_type to destination
+        source_id, destination_id = self.index[source], self.index[destination]
+        for edge, edge_source in enumerate(self.edge_sources):
+            if edge_source == source_id and self.edge_destinations[edge] == destination_id:
+                self.probes.setdefault(edge << 1 | pulse_type, []).append(callback)
+        self.kinds[destination_id] |= PROBED
+
+    def push_button(self) -> None:
+        self.button_presses += 1
+        if not self.rx_received_low:
+            self.rx_received_low_button_count += 1
+        self.queue.append(self.button_pulse)
+
+    def process_pulses(self) -> None:
+        queue = self.queue
+        kinds = self.kinds
+        edge_destinations = self.edge_destinations
+        low_pulses = self.low_pulses
+        high_pulses = self.high_pulses
+        flipflop_states = self.flipflop_states
+        edge_slots = self.edge_slots
+        slot_memory = self.slot_memory
+        input_counts = self.input_counts
+        high_inputs = self.high_inputs
+        probes = self.probes
+        pulse_counts = [0, 0]
+
+        while queue:
+            pulse = queue.popleft()
+            edge = pulse >> 1
+            pulse_type = pulse & 1
+            pulse_counts[pulse_type] += 1
+            destination = edge_destinations[edge]
+            kind = kinds[destination]
+
+            if kind & PROBED:
+                for callback in probes.get(pulse, ()):
+                    callback(self.button_presses)
+                kind ^= PROBED
+
+            if kind == FLIPFLOP:
+                if pulse_type == LOW:
+                    state = flipflop_states[destination] ^ 1
+                    flipflop_states[destination] = state
+                    queue.extend(high_pulses[destination] if state else low_pulses[destination])
+            elif kind == CONJUNCTION:
+                slot = edge_slots[edge]
+                if slot_memory[slot] != pulse_type:
+                    slot_memory[slot] = pulse_type
+                    high_inputs[destination] += 1 if pulse_type else -1
+                if high_inputs[destination] == input_counts[destination]:
+                    queue.extend(low_pulses[destination])
+                else:
+                    queue.extend(high_pulses[destination])
+            elif kind == BROADCASTER:
+                queue.extend(high_pulses[destination] if pulse_type else low_pulses[destination])
+            elif destination == self.rx and pulse_type == LOW:
+                self.rx_received_low = True
+
+        self.low_pulse_count += pulse_counts[LOW]
+        self.high_pulse_count += pulse_counts[HIGH]
+
+    def fingerprint(self) -> bytes:
+        # The whole network state between presses: every flip-flop and every conjunction input
+        return bytes(self.flipflop_states) + bytes(self.slot_memory)
+
+    def restore(self, fingerprint: bytes) -> None:
+        flipflop_count = len(self.flipflop_states)
+        self.flipflop_states[:] = fingerprint[:flipflop_count]
+        self.slot_memory[:] = fingerprint[flipflop_count:]
+        self.high_inputs = [0] * len(self.names)
+        for (_, destination), slot in self.slot_ids.items():
+            self.high_inputs[destination] += self.slot_memory[slot]
+
+    def run_simulation(self, n: int, detect_cycles: bool = False, max_history: int = DEFAULT_MAX_HISTORY) -> None:
+        # With detect_cycles, every fingerprint is kept until the network state repeats.
+        # Periods longer than max_history presses are not looked for, the run then
+        # carries on press by press with memory no longer growing. Presses skipped over
+        # once a cycle is found are never simulated, so with probes registered the run
+        # always goes press by press and every probe sees every press.
+        if not detect_cycles or self.probes:
+            for _ in range(n):
+                self.push_button()
+                self.process_pulses()
+            return
+
+        # states[i] and pulse_totals[i] are taken after i presses of this run
+        states = [self.fingerprint()]
+        seen = {states[0]: 0}
+        pulse_totals = [(self.low_pulse_count, self.high_pulse_count)]
+        for press in range(1, n + 1):
+            self.push_button()
+            self.process_pulses()
+            state = self.fingerprint()
+            pulse_totals.append((self.low_pulse_count, self.high_pulse_count))
+
+            if state in seen:
+                # Every later press repeats the cycle, so the rest is arithmetic
+                cycle_start = seen[state]
+                cycle_length = press - cycle_start
+                cycles, rest = divmod(n - press, cycle_length)
+                cycle_low = pulse_totals[press][0] - pulse_totals[cycle_start][0]
+                cycle_high = pulse_totals[press][1] - pulse_totals[cycle_start][1]
+                rest_low = pulse_totals[cycle_start + rest][0] - pulse_totals[cycle_start][0]
+                rest_high = pulse_totals[cycle_start + rest][1] - pulse_totals[cycle_start][1]
+
+                self.low_pulse_count += cycles * cycle_low + rest_low
+                self.high_pulse_count += cycles * cycle_high + rest_high
+                self.button_presses += n - press
+                if not self.rx_received_low:
+                    # Had rx seen a LOW inside the cycle it would already be set
+                    self.rx_received_low_button_count += n - press
+                self.restore(states[cycle_start + rest])
+                return
+
+            if press >= max_history:
+                self.run_simulation(n - press)
+                return
+
+            seen[state] = press
+            states.append(state)
+
+    def run_simulation_until_rx_low(self, max_runs: int = 100000000) -> int:
+        i = 0
+        while i < max_runs:
+            if self.rx_received_low:
+                return self.rx_received_low_button_count
+            i += 1
+            self.push_button()
+            self.process_pulses()
+
+        return -1
+
+
+def find_rx_press_count(module_config, confirmations: int = 3, max_presses: int = 1000000) -> int:
+    """Fewest button presses until rx receives a LOW pulse, without brute force.
+
+    rx is fed by conjunctions, which only send LOW once every one of their
+    inputs has sent HIGH. Each of those inputs is probed for the presses at
+    which it sends HIGH. Once every input has shown confirmations hits at
+    whole multiples of its first hit, the answer for a feeder is the LCM of
+    the periods. A conjunction without inputs never receives a pulse, so it
+    never feeds rx and is skipped. If rx is fed by anything else the presses
+    are simulated directly. Returns -1 when no answer is found within
+    max_presses.
+    """
+    engine = CompiledPulseEngine(module_config)
+    if engine.rx < 0:
+        return -1
+
+    feeders = [i for i, edge_destination in enumerate(engine.edge_destinations) if edge_destination == engine.rx]
+    feeders = sorted({engine.edge_sources[edge] for edge in feeders})
+    if not feeders or any(engine.kinds[feeder] != CONJUNCTION for feeder in feeders):
+        return engine.run_simulation_until_rx_low(max_presses)
+
+    feeders = [feeder for feeder in feeders if engine.input_counts[feeder]]
+    if not feeders:
+        return -1
+
+    # (input, feeder) -> presses at which input sent HIGH to feeder
+    hits: Dict[Tuple[int, int], List[int]] = {}
+    for source, destination in engine.slot_ids:
+        if destination in feeders:
+            presses = hits.setdefault((source, destination), [])
+
+            def record_hit(button_presses: int, presses: List[int] = presses) -> None:
+                if not presses or presses[-1] != button_presses:
+                    presses.append(button_presses)
+
+            engine.add_probe(engine.names[source], engine.names[destination], HIGH, record_hit)
+
+    while engine.button_presses < max_presses:
+        engine.push_button()
+        engine.process_pulses()
+        if engine.rx_received_low:
+            return engine.button_presses
+
+        if all(len(presses) >= confirmations for presses in hits.values()):
+            break
+    else:
+        return -1
+
+    press_counts = []
+    for feeder in feeders:
+        periods = []
+        for (source, destination), presses in hits.items():
+            if destination != feeder:
+                continue
+            period = presses[0]
+            if any(press != period * (i + 1) for i, press in enumerate(presses)):
+                return -1  # not a clean cycle starting from the first press
+            periods.append(period)
+        press_counts.append(lcm(*periods))
+
+    # rx gets a LOW as soon as any one of its feeders sends one
+    return min(press_counts)
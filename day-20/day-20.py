@@ -1,8 +1,20 @@
 from __future__ import annotations
 from enum import Enum
-from typing import List, Union, Dict
+from typing import Callable, Dict, List, Tuple, Union
 from queue import Queue
 import os
+import tempfile
+
+from compiled_pulses import HIGH, CompiledPulseEngine, find_rx_press_count
+from pulse_log import (
+    DEFAULT_PULSE_LOG_SIZE,
+    BinaryFileLogSink,
+    PulseLogSink,
+    RingBufferLogSink,
+    SampledLogSink,
+    format_log_entry,
+    read_pulse_log,
+)
 
 class BaseModule:
     module_type: str = "base"
@@ -18,6 +30,9 @@ class BaseModule:
     def handle_pulse(self, pulse: PulseEvent) -> List[PulseEvent]:
         return []
 
+    def state_snapshot(self):
+        # Comparable copy of the module state, used to spot state transitions
+        return None
 
 
 class BroadcasterModule(BaseModule):
@@ -51,6 +66,9 @@ class FlipflopModule(BaseModule):
                 new_pulses.append(PulseEvent(source=self, destination=dest, pulse_type=new_pulse_type))
         return new_pulses
 
+    def state_snapshot(self):
+        return self.state
+
 class ConjunctionState(Enum):
     LOW_PULSE_REMEMBER = 1
     HIGH_PULSE_REMEMBER = 2
@@ -76,6 +94,9 @@ class ConjunctionModule(BaseModule):
 
         return new_pulses
 
+    def state_snapshot(self):
+        return tuple(self.states.values())
+
 
 class ButtonModule(BaseModule):
     module_type = "button"
@@ -170,11 +191,31 @@ class PulseManager:
         self.high_pulse_count = 0
         self.rx_received_low: bool = False
         self.rx_received_low_button_count: int = 0
-        self.pulse_log: List[PulseEvent] = []
+        self.button_presses: int = 0
+        # Bounded by default, swap in another PulseLogSink to sample or stream to a file
+        self.log_sink: PulseLogSink = RingBufferLogSink(DEFAULT_PULSE_LOG_SIZE)
         self.keep_logs: bool = True
         self.rx_inputs_logs: set[str] = set()
+        # (source, destination, pulse type) -> callbacks taking the button press count and the pulse
+        self.edge_probes: Dict[Tuple[str, str, PulseType], List[Callable[[int, PulseEvent], None]]] = {}
+        # Module name -> callbacks taking the button press count and the module, after its state changed
+        self.state_probes: Dict[str, List[Callable[[int, BaseModule], None]]] = {}
+        # Destinations of probed edges, so other pulses skip the probe lookup
+        self.probed_destinations: set[str] = set()
+
+    def add_edge_probe(
+        self, source: str, destination: str, pulse_type: PulseType, callback: Callable[[int, PulseEvent], None]
+    ) -> None:
+        # Calls callback(button_presses, pulse) whenever source sends pulse_type to destination
+        self.edge_probes.setdefault((source, destination, pulse_type), []).append(callback)
+        self.probed_destinations.add(destination)
+
+    def add_state_probe(self, module_name: str, callback: Callable[[int, BaseModule], None]) -> None:
+        # Calls callback(button_presses, module) whenever a pulse changes the state of the module
+        self.state_probes.setdefault(module_name, []).append(callback)
 
     def push_button(self):
+        self.button_presses += 1
         if not self.rx_received_low:
             self.rx_received_low_button_count += 1
 
@@ -186,11 +227,21 @@ class PulseManager:
         self.queue.put(PulseEvent(source=button, destination=broadcaster, pulse_type=PulseType.LOW))
 
     def process_pulses(self):
+        # Both stay empty unless a probe is added, then each pulse costs one falsy check
+        probed_destinations = self.probed_destinations
+        state_probes = self.state_probes
+
         while not self.queue.empty():
             pulse_event = self.queue.get()
+            destination = pulse_event.destination
 
             if self.keep_logs:
-                self.pulse_log.append(pulse_event)
+                self.log_sink.record(
+                    self.button_presses,
+                    pulse_event.source.module_name,
+                    pulse_event.destination.module_name,
+                    pulse_event.pulse_type.value,
+                )
             
             if self.check_rx_low(pulse_event):
                self.rx_received_low = True
@@ -202,11 +253,22 @@ class PulseManager:
             else:
                 assert 0
             
-            new_pulses = pulse_event.destination.handle_pulse(pulse_event)
+            if probed_destinations and destination.module_name in probed_destinations:
+                key = (pulse_event.source.module_name, destination.module_name, pulse_event.pulse_type)
+                for callback in self.edge_probes.get(key, ()):
+                    callback(self.button_presses, pulse_event)
+
+            if state_probes and destination.module_name in state_probes:
+                state = destination.state_snapshot()
+                new_pulses = destination.handle_pulse(pulse_event)
+                if destination.state_snapshot() != state:
+                    for callback in state_probes[destination.module_name]:
+                        callback(self.button_presses, destination)
+            else:
+                new_pulses = destination.handle_pulse(pulse_event)
+
             for pulse in new_pulses:
                 self.queue.put(pulse)
-            
-            self.check_rx_inputs_state()
 
     def run_simulation(self, n: int):
         for _ in range(n):
@@ -226,7 +288,7 @@ class PulseManager:
         return -1        
 
     def get_formatted_pulse_log(self) -> str:
-        return "\n".join(str(pulse_event) for pulse_event in self.pulse_log)
+        return "\n".join(format_log_entry(entry) for entry in self.log_sink.entries())
     
     @staticmethod
     def check_rx_low(pulse_event: PulseEvent) -> bool:
@@ -236,21 +298,22 @@ class PulseManager:
         
         return False
 
-    def check_rx_inputs_state(self):
-        # dr connects to rx
-        # dr == conjunction, so it must remember all high pulses in order to give a low pulse to rx
-        # dr connectors are: qt, qb, ng, mp
-        # let's find a pattern when these send a high pulse ... 
-        dr = self.module_config.modules.get("dr")
-        if not isinstance(dr, ConjunctionModule):
-            return
-                
-        for input, state in dr.states.items():
-            if state == PulseType.HIGH:
-                log = f"Button press: {self.rx_received_low_button_count}, {input} is HIGH"
-                if log not in self.rx_inputs_logs:
-                    print(log)
-                    self.rx_inputs_logs.add(log)
+    def log_rx_inputs(self) -> None:
+        # rx is fed by conjunctions, which only send LOW once all of their inputs sent HIGH.
+        # Print the presses at which each of those inputs sends HIGH to find their cycles.
+        for feeder in self.module_config.modules.values():
+            if not isinstance(feeder, ConjunctionModule):
+                continue
+            if not any(dest.module_name == "rx" for dest in feeder.destinations):
+                continue
+            for input_name in feeder.states:
+                self.add_edge_probe(input_name, feeder.module_name, PulseType.HIGH, self.log_rx_input_high)
+
+    def log_rx_input_high(self, button_presses: int, pulse_event: PulseEvent) -> None:
+        log = f"Button press: {button_presses}, {pulse_event.source.module_name} is HIGH"
+        if log not in self.rx_inputs_logs:
+            print(log)
+            self.rx_inputs_logs.add(log)
 
 
 def test_example_data() -> None:
@@ -298,6 +361,170 @@ def test_example_data2() -> None:
     pulse_product = pulse_manager.low_pulse_count * pulse_manager.high_pulse_count
     assert pulse_product == 11687500
 
+def test_compiled_engine() -> None:
+    example_data = [
+        "broadcaster -> a",
+        "%a -> inv, con",
+        "&inv -> b",
+        "%b -> con",
+        "&con -> output",
+    ]
+
+    pulse_manager = PulseManager(ModuleConfiguration(example_data))
+    pulse_manager.keep_logs = False
+    pulse_manager.run_simulation(1000)
+
+    engine = CompiledPulseEngine(ModuleConfiguration(example_data))
+    engine.run_simulation(1000)
+
+    assert engine.low_pulse_count == pulse_manager.low_pulse_count
+    assert engine.high_pulse_count == pulse_manager.high_pulse_count
+
+def test_cycle_extrapolation() -> None:
+    example_data = [
+        "broadcaster -> a",
+        "%a -> inv, con",
+        "&inv -> b",
+        "%b -> con",
+        "&con -> output",
+    ]
+
+    for n in (1, 3, 1000, 1001):
+        engine = CompiledPulseEngine(ModuleConfiguration(example_data))
+        engine.run_simulation(n)
+        extrapolated = CompiledPulseEngine(ModuleConfiguration(example_data))
+        extrapolated.run_simulation(n, detect_cycles=True)
+
+        assert extrapolated.low_pulse_count == engine.low_pulse_count
+        assert extrapolated.high_pulse_count == engine.high_pulse_count
+        assert extrapolated.fingerprint() == engine.fingerprint()
+
+        # A history too short for the 4 press period falls back to plain simulation
+        bounded = CompiledPulseEngine(ModuleConfiguration(example_data))
+        bounded.run_simulation(n, detect_cycles=True, max_history=2)
+        assert bounded.low_pulse_count == engine.low_pulse_count
+        assert bounded.high_pulse_count == engine.high_pulse_count
+        assert bounded.fingerprint() == engine.fingerprint()
+
+    # Probes would miss the skipped presses, so a probed run is simulated in full
+    engine = CompiledPulseEngine(ModuleConfiguration(example_data))
+    b_high_presses = []
+    engine.add_probe("b", "con", HIGH, b_high_presses.append)
+    engine.run_simulation(20, detect_cycles=True)
+    assert b_high_presses == [1, 5, 9, 13, 17]
+
+    # The network repeats every 4 presses, so 10^12 presses take no time
+    engine = CompiledPulseEngine(ModuleConfiguration(example_data))
+    engine.run_simulation(10**12, detect_cycles=True)
+    assert engine.low_pulse_count * engine.high_pulse_count == 11687500 * 10**18
+
+def test_pulse_log_sinks() -> None:
+    example_data = [
+        "broadcaster -> a, b, c",
+        "%a -> b",
+        "%b -> c",
+        "%c -> inv",
+        "&inv -> a",
+    ]
+
+    # 12 pulses per press, only the last 20 are kept
+    pulse_manager = PulseManager(ModuleConfiguration(example_data))
+    pulse_manager.log_sink = RingBufferLogSink(20)
+    pulse_manager.run_simulation(10)
+    assert len(list(pulse_manager.log_sink.entries())) == 20
+
+    # Only every third press is kept, all 12 pulses of each
+    pulse_manager = PulseManager(ModuleConfiguration(example_data))
+    pulse_manager.log_sink = SampledLogSink(RingBufferLogSink(DEFAULT_PULSE_LOG_SIZE), 3)
+    pulse_manager.run_simulation(10)
+    sampled_presses = [press for press, _, _, _ in pulse_manager.log_sink.entries()]
+    assert sampled_presses == [press for press in (3, 6, 9) for _ in range(12)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, "pulses.bin.gz")
+        module_config = ModuleConfiguration(example_data)
+        pulse_manager = PulseManager(module_config)
+        pulse_manager.log_sink = BinaryFileLogSink(log_path, list(module_config.modules))
+        pulse_manager.run_simulation(1)
+        assert pulse_manager.get_formatted_pulse_log().splitlines()[:2] == ["button -low-> broadcaster", "broadcaster -low-> a"]
+
+        pulse_manager.run_simulation(999)
+        pulse_manager.log_sink.close()
+        inv_high_pulses = list(read_pulse_log(log_path, source="inv", pulse_type="high"))
+        assert len(inv_high_pulses) == 1000
+        assert inv_high_pulses[-1] == (1000, "inv", "a", "high")
+
+def test_rx_press_count() -> None:
+    # Two self-resetting counters that fire every 3 and every 5 presses
+    example_data = [
+        "broadcaster -> f0_0, f1_0",
+        "%f0_0 -> f0_1, c0",
+        "%f0_1 -> c0",
+        "&c0 -> f0_0, i0",
+        "&i0 -> hb",
+        "%f1_0 -> f1_1, c1",
+        "%f1_1 -> f1_2",
+        "%f1_2 -> c1",
+        "&c1 -> f1_0, f1_1, i1",
+        "&i1 -> hb",
+        "&hb -> rx",
+    ]
+
+    assert find_rx_press_count(ModuleConfiguration(example_data)) == 15
+
+    pulse_manager = PulseManager(ModuleConfiguration(example_data))
+    pulse_manager.keep_logs = False
+    pulse_manager.log_rx_inputs()
+    assert pulse_manager.run_simulation_until_rx_low() == 15
+    # i0 sends HIGH to hb every 3 presses and i1 every 5, both at once on press 15
+    assert pulse_manager.rx_inputs_logs == {
+        f"Button press: {press}, {input_name} is HIGH"
+        for input_name, period in (("i0", 3), ("i1", 5))
+        for press in range(period, 16, period)
+    }
+
+    # A conjunction without inputs never sends anything, so rx never gets a LOW
+    example_data = [
+        "broadcaster -> m2",
+        "&m0 -> rx, m1",
+        "&m1 -> out",
+        "%m2 -> out",
+    ]
+    assert find_rx_press_count(ModuleConfiguration(example_data), max_presses=1000) == -1
+    assert CompiledPulseEngine(ModuleConfiguration(example_data)).run_simulation_until_rx_low(1000) == -1
+
+def test_probes() -> None:
+    example_data = [
+        "broadcaster -> a",
+        "%a -> inv, con",
+        "&inv -> b",
+        "%b -> con",
+        "&con -> output",
+    ]
+
+    pulse_manager = PulseManager(ModuleConfiguration(example_data))
+    pulse_manager.keep_logs = False
+    a_high_presses = []
+    pulse_manager.add_edge_probe("a", "con", PulseType.HIGH, lambda press, pulse: a_high_presses.append(press))
+    b_states = []
+    pulse_manager.add_state_probe("b", lambda press, module: b_states.append((press, module.state)))
+    con_changes = []
+    pulse_manager.add_state_probe("con", lambda press, module: con_changes.append(press))
+    pulse_manager.run_simulation(8)
+
+    # a flips on every press, b on every second one
+    assert a_high_presses == [1, 3, 5, 7]
+    assert b_states == [(1, FlipflopState.ON), (3, FlipflopState.OFF), (5, FlipflopState.ON), (7, FlipflopState.OFF)]
+    # con remembers one pulse per input, a changes on every press and b with it on odd presses
+    assert con_changes == [1, 1, 2, 3, 3, 4, 5, 5, 6, 7, 7, 8]
+
+    # Probes only observe, the pulse counts match an unprobed run
+    unprobed = PulseManager(ModuleConfiguration(example_data))
+    unprobed.keep_logs = False
+    unprobed.run_simulation(8)
+    assert unprobed.low_pulse_count == pulse_manager.low_pulse_count
+    assert unprobed.high_pulse_count == pulse_manager.high_pulse_count
+
 def readlines_from_file(file_path: str) -> List[str]:
     assert os.path.exists(file_path)
 
@@ -314,6 +541,16 @@ if __name__ == "__main__":
 
     test_example_data2()
 
+    test_compiled_engine()
+
+    test_rx_press_count()
+
+    test_cycle_extrapolation()
+
+    test_pulse_log_sinks()
+
+    test_probes()
+
     py_file_path = os.path.dirname(__file__)
     puzzle_doc_path = os.path.join(py_file_path, "puzzle_input.txt")
 
@@ -335,9 +572,15 @@ if __name__ == "__main__":
     print("\npulse pulse_product:")
     print(pulse_product)
 
-    pulse_manager.keep_logs = False
-    buttons_presses_until_rx_low = pulse_manager.run_simulation_until_rx_low()
+    # Start from a fresh configuration, the one above has been pushed 1000 times
+    buttons_presses_until_rx_low = find_rx_press_count(ModuleConfiguration(puzzle_lines))
     
     print("\nnumber of button presses until rx received low:")
-    print(f"{pulse_manager.rx_received_low_button_count}")
-    print(f"RX received low pulse?: {pulse_manager.rx_received_low}")
+    print(f"{buttons_presses_until_rx_low}")
+
+    # The inputs of the conjunction feeding rx each send HIGH once per cycle, show the first few
+    print("\nrx input cycles:")
+    pulse_manager = PulseManager(ModuleConfiguration(puzzle_lines))
+    pulse_manager.keep_logs = False
+    pulse_manager.log_rx_inputs()
+    pulse_manager.run_simulation(10000)
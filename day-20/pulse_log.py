@@ -0,0 +1,113 @@
+import gzip
+import json
+import struct
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Pulses PulseManager keeps by default, enough for a few presses of a puzzle input
+DEFAULT_PULSE_LOG_SIZE = 10000
+
+# (button press, source name, destination name, "low" or "high")
+LogEntry = Tuple[int, str, str, str]
+
+# press, source id, destination id, 0 for low and 1 for high
+RECORD = struct.Struct("<QHHB")
+PULSE_TYPES = ("low", "high")
+
+
+def format_log_entry(entry: LogEntry) -> str:
+    _, source, destination, pulse_type = entry
+    return f"{source} -{pulse_type}-> {destination}"
+
+
+class PulseLogSink:
+    """Where PulseManager sends its pulse log. The base sink drops everything."""
+
+    def record(self, press: int, source: str, destination: str, pulse_type: str) -> None:
+        pass
+
+    def entries(self) -> Iterable[LogEntry]:
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class RingBufferLogSink(PulseLogSink):
+    # Keeps only the last maxlen pulses
+    def __init__(self, maxlen: int) -> None:
+        self.log: deque = deque(maxlen=maxlen)
+
+    def record(self, press: int, source: str, destination: str, pulse_type: str) -> None:
+        self.log.append((press, source, destination, pulse_type))
+
+    def entries(self) -> Iterable[LogEntry]:
+        return self.log
+
+
+class SampledLogSink(PulseLogSink):
+    # Forwards the pulses of every n-th button press to another sink
+    def __init__(self, sink: PulseLogSink, every: int) -> None:
+        self.sink = sink
+        self.every = every
+
+    def record(self, press: int, source: str, destination: str, pulse_type: str) -> None:
+        if press % self.every == 0:
+            self.sink.record(press, source, destination, pulse_type)
+
+    def entries(self) -> Iterable[LogEntry]:
+        return self.sink.entries()
+
+    def close(self) -> None:
+        self.sink.close()
+
+
+class BinaryFileLogSink(PulseLogSink):
+    """Streams fixed-size binary records to a gzip file.
+
+    The file starts with one JSON line holding the module names, and every
+    record after it is (press, source id, destination id, type) packed with
+    RECORD. Memory stays constant however long the run is. Use
+    read_pulse_log to replay and filter the file afterwards.
+    """
+
+    def __init__(self, file_path: str, module_names: List[str]) -> None:
+        self.file_path = file_path
+        self.ids = {name: i for i, name in enumerate(module_names)}
+        self.file = gzip.open(file_path, "wb")
+        self.file.write(json.dumps(module_names).encode() + b"\n")
+
+    def record(self, press: int, source: str, destination: str, pulse_type: str) -> None:
+        self.file.write(RECORD.pack(press, self.ids[source], self.ids[destination], pulse_type == "high"))
+
+    def entries(self) -> Iterable[LogEntry]:
+        self.file.flush()
+        return read_pulse_log(self.file_path)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_pulse_log(
+    file_path: str, source: Optional[str] = None, destination: Optional[str] = None, pulse_type: Optional[str] = None
+) -> Iterator[LogEntry]:
+    # Replays a BinaryFileLogSink file, keeping only entries that match every given filter
+    with gzip.open(file_path, "rb") as f:
+        module_names = json.loads(f.readline())
+        while True:
+            try:
+                record = f.read(RECORD.size)
+            except EOFError:
+                return  # the sink is still open, stop at what has been flushed so far
+            if len(record) < RECORD.size:
+                return
+
+            press, source_id, destination_id, is_high = RECORD.unpack(record)
+            entry = (press, module_names[source_id], module_names[destination_id], PULSE_TYPES[is_high])
+            if source is not None and entry[1] != source:
+                continue
+            if destination is not None and entry[2] != destination:
+                continue
+            if pulse_type is not None and entry[3] != pulse_type:
+                continue
+            yield entry
@@ -1,5 +1,10 @@
 import os
-from typing import List
+from typing import Iterable, List, Optional
+
+from number_index import NumberIndex
+from schematic_parallel import DEFAULT_BAND_HEIGHT, sum_schematic_parallel
+from schematic_stream import stream_schematic
+from symbol_dilation import sum_of_part_numbers_vectorized
 
 
 def readlines_from_file(file_path: str) -> List[str]:
@@ -14,55 +19,29 @@ def readlines_from_file(file_path: str) -> List[str]:
     return lines
 
 
-def sum_of_all_engine_parts(engine_diagram: List[str]) -> int:
-    SPECIAL_SYMBOLS = {"*", "#", "+", "$", "&", "/", "@", "-", "%", "=", "+"}
-    total_sum = 0
-
-    # Helper function to find start and end indices of a number in a row
-    def find_number_indices(row, start_index):
-        end_index = start_index
-        while end_index < len(row) and row[end_index].isdigit():
-            end_index += 1
-        return start_index, end_index - 1
-
-    # Function to get adjacent indices for a range (start_index, end_index) in a row
-    def get_adjacent_indices(row_index, start_index, end_index):
-        adjacent_indices = []
-        for i in range(start_index, end_index + 1):
-            for x in range(row_index - 1, row_index + 2):
-                for y in range(i - 1, i + 2):
-                    if (
-                        0 <= x < len(engine_diagram)
-                        and 0 <= y < len(engine_diagram[row_index])
-                        and not (x == row_index and y == i)
-                    ):
-                        adjacent_indices.append((x, y))
-        return adjacent_indices
-
-    # Loop through each character in the grid
-    for i, row in enumerate(engine_diagram):
-        j = 0
-        while j < len(row):
-            if row[j].isdigit():
-                # Identify the complete number
-                start_index, end_index = find_number_indices(row, j)
-                number = int(row[start_index : end_index + 1])
-                # Generate indices for all adjacent cells of the number
-                adjacent_indices = get_adjacent_indices(i, start_index, end_index)
-                # Check for special symbols in adjacent cells
-                if any(
-                    engine_diagram[x][y] in SPECIAL_SYMBOLS for x, y in adjacent_indices
-                ):
-                    total_sum += number
-                else:
-                    message = f"Number is not part of the total_sum: {number}"
-
-                # Skip to the end of the current number
-                j = end_index + 1
-            else:
-                j += 1
-
-    return total_sum
+SPECIAL_SYMBOLS = {"*", "#", "+", "$", "&", "/", "@", "-", "%", "="}
+
+
+def sum_of_all_engine_parts(engine_diagram: Iterable[str], engine: str = "python") -> int:
+    if engine == "stream":
+        # Any iterable of rows works here, an open file is read lazily
+        return sum(value for kind, value in stream_schematic(engine_diagram, SPECIAL_SYMBOLS, None) if kind == "part")
+
+    # The other engines need the whole diagram in memory
+    engine_diagram = list(engine_diagram)
+    if engine == "numpy":
+        # Treats every byte other than a digit or '.' as a symbol
+        return sum_of_part_numbers_vectorized(engine_diagram)
+
+    assert engine == "python"
+    return NumberIndex(engine_diagram).sum_of_part_numbers(SPECIAL_SYMBOLS)
+
+
+def sum_of_all_engine_parts_parallel(
+    engine_diagram: List[str], workers: Optional[int] = None, band_height: int = DEFAULT_BAND_HEIGHT
+) -> int:
+    part_sum, _ = sum_schematic_parallel(engine_diagram, SPECIAL_SYMBOLS, None, workers, band_height)
+    return part_sum
 
 
 def test_example_date():
@@ -82,6 +61,16 @@ def test_example_date():
     result = sum_of_all_engine_parts(example_data)
 
     assert result == 4361
+    assert sum_of_all_engine_parts(example_data, engine="numpy") == 4361
+    assert sum_of_all_engine_parts(iter(example_data), engine="stream") == 4361
+    assert sum_of_all_engine_parts(iter(example_data)) == sum_of_all_engine_parts(iter(example_data), engine="numpy") == 4361
+    assert sum_of_all_engine_parts_parallel(example_data, workers=2, band_height=3) == 4361
+    # '!' is missing from SPECIAL_SYMBOLS but the numpy engine still sees it
+    assert sum_of_all_engine_parts(["12!.", "...7"], engine="numpy") == 19
+    # Non-ASCII symbols and numbers too long for an int64
+    assert sum_of_all_engine_parts(["12é.", "*..."], engine="numpy") == 12
+    long_numbers = ["1234567890123456789012*", "." * 23, "999999999999999999*999999999999999999"]
+    assert sum_of_all_engine_parts(long_numbers, engine="numpy") == 1234567890123456789012 + 2 * 999999999999999999
 
 
 if __name__ == "__main__":
@@ -1,5 +1,10 @@
 import os
-from typing import List
+from typing import Iterable, List, Optional
+
+from number_index import NumberIndex
+from schematic import Schematic
+from schematic_parallel import DEFAULT_BAND_HEIGHT, sum_schematic_parallel
+from schematic_stream import stream_schematic
 
 def readlines_from_file(file_path: str) -> List[str]:
     assert(os.path.exists(file_path))
@@ -12,62 +17,25 @@ def readlines_from_file(file_path: str) -> List[str]:
 
     return lines
 
-def sum_of_all_gear_ratios(engine_diagram: List[str]) -> int:
-    GEAR_SYMBOL = '*'
-    total_sum = 0
-
-    # Helper function to find start and end indices of a number in a row
-    def find_number_indices(row, start_index):
-        end_index = start_index
-        while end_index < len(row) and row[end_index].isdigit():
-            end_index += 1
-        return start_index, end_index - 1
-
-    # Helper function to find start and end indices of a number in a row
-    def find_complete_number(row, index):
-        # Find the start of the number
-        start_index = index
-        while start_index > 0 and row[start_index - 1].isdigit():
-            start_index -= 1
-
-        # Find the end of the number
-        end_index = index
-        while end_index < len(row) - 1 and row[end_index + 1].isdigit():
-            end_index += 1
-
-        # Return the complete number
-        return int(row[start_index:end_index + 1])
-    
-    # Function to find all adjacent numbers to a particular index
-    def find_adjacent_numbers(row_index, col_index):
-        adjacent_numbers = []
-        processed_indices = set()
-        for x in range(row_index - 1, row_index + 2):
-            for y in range(col_index - 1, col_index + 2):
-                if 0 <= x < len(engine_diagram) and 0 <= y < len(engine_diagram[x]) and (x, y) not in processed_indices:
-                    char = engine_diagram[x][y]
-                    if char.isdigit():
-                        number = find_complete_number(engine_diagram[x], y)
-                        start_index, end_index = find_number_indices(engine_diagram[x], y)
-                        adjacent_numbers.append(number)
-                        
-                        # Add all indices of this number to processed_indices to avoid re-processing
-                        for i in range(start_index, end_index + 1):
-                            processed_indices.add((x, i))
-        return adjacent_numbers
-
-    # Loop through each character in the grid
-    for i, row in enumerate(engine_diagram):
-        for j, char in enumerate(row):
-            if char == GEAR_SYMBOL:
-                adjacent_numbers = find_adjacent_numbers(i, j)
-                # Check if there are exactly two numbers adjacent to '*'
-                if len(adjacent_numbers) == 2:
-                    total_sum += adjacent_numbers[0] * adjacent_numbers[1]
-                else:
-                    pass
-
-    return total_sum
+GEAR_SYMBOL = "*"
+
+
+def sum_of_all_gear_ratios(engine_diagram: Iterable[str], engine: str = "python") -> int:
+    if engine == "stream":
+        # Any iterable of rows works here, an open file is read lazily
+        return sum(value for kind, value in stream_schematic(engine_diagram, None, GEAR_SYMBOL) if kind == "gear")
+
+    assert engine == "python"
+    # The index needs the whole diagram in memory
+    engine_diagram = list(engine_diagram)
+    return NumberIndex(engine_diagram).sum_of_gear_ratios(GEAR_SYMBOL)
+
+
+def sum_of_all_gear_ratios_parallel(
+    engine_diagram: List[str], workers: Optional[int] = None, band_height: int = DEFAULT_BAND_HEIGHT
+) -> int:
+    _, gear_sum = sum_schematic_parallel(engine_diagram, None, GEAR_SYMBOL, workers, band_height)
+    return gear_sum
 
 
 def test_example_date():
@@ -87,10 +55,43 @@ def test_example_date():
     result = sum_of_all_gear_ratios(example_data)
 
     assert result == 467835
+    assert sum_of_all_gear_ratios(iter(example_data), engine="stream") == 467835
+    assert sum_of_all_gear_ratios(iter(example_data)) == 467835
+    assert sum_of_all_gear_ratios_parallel(example_data, workers=2, band_height=3) == 467835
+
+
+def test_schematic_edits():
+    example_data = [
+        "467..114..",
+        "...*......",
+        "..35..633.",
+        "......#...",
+        "617*......",
+        ".....+.58.",
+        "..592.....",
+        "......755.",
+        "...$.*....",
+        ".664.598..",
+    ]
+    # The day 3 part 1 symbols, which include the gear
+    symbols = {"*", "#", "+", "$", "&", "/", "@", "-", "%", "="}
+
+    schematic = Schematic(example_data, symbols, GEAR_SYMBOL)
+    assert schematic.part_total == 4361
+    assert schematic.gear_total == 467835
+
+    # Merge two numbers, split one, move a symbol and add a gear
+    edits = [(0, 3, "9"), (0, 4, "1"), (2, 3, "."), (3, 6, "."), (3, 7, "*"), (4, 3, "4"), (1, 3, ".")]
+    for row_index, col_index, char in edits:
+        schematic.set(row_index, col_index, char)
+        engine_diagram = ["".join(row) for row in schematic.rows]
+        assert schematic.gear_total == sum_of_all_gear_ratios(engine_diagram)
+        assert schematic.part_total == NumberIndex(engine_diagram).sum_of_part_numbers(symbols)
 
 
 if __name__ == "__main__":
     test_example_date()
+    test_schematic_edits()
     
     py_file_path = os.path.dirname(__file__)
     puzzle_doc_path = os.path.join(py_file_path, "puzzle_input.txt")
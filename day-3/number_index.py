@@ -0,0 +1,66 @@
+import re
+from array import array
+from typing import Container, List, Set
+
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+class NumberIndex:
+    """Labels every number span of an engine schematic in one pass.
+
+    labels is a flat, row-major grid of number ids (-1 where there is no
+    digit) and values[id] holds the number itself, so the numbers around any
+    cell are found with at most nine array lookups.
+    """
+
+    def __init__(self, engine_diagram: List[str]) -> None:
+        self.engine_diagram = engine_diagram
+        self.height = len(engine_diagram)
+        self.width = max((len(row) for row in engine_diagram), default=0)
+        self.labels = array("l", [-1]) * (self.height * self.width)
+        self.values: List[int] = []
+
+        for i, row in enumerate(engine_diagram):
+            row_offset = i * self.width
+            for match in NUMBER_PATTERN.finditer(row):
+                number_id = len(self.values)
+                self.values.append(int(match.group()))
+                start_index, end_index = match.span()
+                self.labels[row_offset + start_index : row_offset + end_index] = array(
+                    "l", [number_id]
+                ) * (end_index - start_index)
+
+    def adjacent_number_ids(self, row_index: int, col_index: int) -> Set[int]:
+        # Ids of the distinct numbers touching a cell, including diagonally
+        number_ids = set()
+        for x in range(max(row_index - 1, 0), min(row_index + 2, self.height)):
+            row_offset = x * self.width
+            for y in range(max(col_index - 1, 0), min(col_index + 2, len(self.engine_diagram[x]))):
+                number_id = self.labels[row_offset + y]
+                if number_id >= 0:
+                    number_ids.add(number_id)
+        return number_ids
+
+    def sum_of_part_numbers(self, symbols: Container[str]) -> int:
+        # Every number next to at least one symbol counts exactly once
+        part_ids = set()
+        for i, row in enumerate(self.engine_diagram):
+            for j, char in enumerate(row):
+                if char in symbols:
+                    part_ids.update(self.adjacent_number_ids(i, j))
+
+        return sum(self.values[number_id] for number_id in part_ids)
+
+    def sum_of_gear_ratios(self, gear_symbol: str) -> int:
+        total_sum = 0
+        for i, row in enumerate(self.engine_diagram):
+            j = row.find(gear_symbol)
+            while j != -1:
+                number_ids = self.adjacent_number_ids(i, j)
+                # A gear touches exactly two numbers
+                if len(number_ids) == 2:
+                    first_id, second_id = number_ids
+                    total_sum += self.values[first_id] * self.values[second_id]
+                j = row.find(gear_symbol, j + 1)
+
+        return total_sum
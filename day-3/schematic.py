@@ -0,0 +1,119 @@
+from array import array
+from typing import Container, Dict, List, Set, Tuple
+
+from number_index import NUMBER_PATTERN
+
+
+class Schematic:
+    """Engine schematic that keeps both day 3 totals current under cell edits.
+
+    Every number span has an id in a per-row label grid. Setting a cell only
+    relabels the digit runs of that row touching the cell, then refreshes the
+    part status of numbers and the ratio of gears in the surrounding rows.
+    """
+
+    def __init__(self, engine_diagram: List[str], symbols: Container[str], gear_symbol: str) -> None:
+        self.symbols = symbols
+        self.gear_symbol = gear_symbol
+        self.rows: List[List[str]] = [list(row.rstrip("\r\n")) for row in engine_diagram]
+        self.labels: List[array] = [array("l", [-1]) * len(row) for row in self.rows]
+        # id -> (row_index, start_index, end_index, value), end_index exclusive
+        self.numbers: Dict[int, Tuple[int, int, int, int]] = {}
+        self.part_ids: Set[int] = set()
+        self.gear_ratios: Dict[Tuple[int, int], int] = {}
+        self.part_total = 0
+        self.gear_total = 0
+        self.next_id = 0
+
+        for i, row in enumerate(self.rows):
+            for match in NUMBER_PATTERN.finditer("".join(row)):
+                self._add_number(i, *match.span())
+
+        for number_id in list(self.numbers):
+            self._update_part(number_id)
+
+        for i, row in enumerate(self.rows):
+            for j, char in enumerate(row):
+                if char == gear_symbol:
+                    self._update_gear(i, j)
+
+    def get(self, row_index: int, col_index: int) -> str:
+        return self.rows[row_index][col_index]
+
+    def set(self, row_index: int, col_index: int, char: str) -> None:
+        row = self.rows[row_index]
+        if row[col_index] == char:
+            return
+
+        # Runs next to the cell can be split or merged, so take them out first
+        lo, hi = col_index, col_index + 1
+        for number_id in self._number_ids_in(row_index, row_index + 1, col_index - 1, col_index + 2):
+            _, start_index, end_index, _ = self.numbers[number_id]
+            lo, hi = min(lo, start_index), max(hi, end_index)
+            self._remove_number(number_id)
+
+        row[col_index] = char
+
+        for match in NUMBER_PATTERN.finditer("".join(row[lo:hi])):
+            start_index, end_index = match.span()
+            self._add_number(row_index, lo + start_index, lo + end_index)
+
+        # Only numbers and gears within one cell of [lo, hi) on the nearby rows can change
+        for number_id in self._number_ids_in(row_index - 1, row_index + 2, lo - 1, hi + 1):
+            self._update_part(number_id)
+
+        for i in range(max(row_index - 1, 0), min(row_index + 2, len(self.rows))):
+            for j in range(max(lo - 1, 0), min(hi + 1, len(self.rows[i]))):
+                self._update_gear(i, j)
+
+    def _add_number(self, row_index: int, start_index: int, end_index: int) -> None:
+        number_id = self.next_id
+        self.next_id += 1
+        value = int("".join(self.rows[row_index][start_index:end_index]))
+        self.numbers[number_id] = (row_index, start_index, end_index, value)
+        self.labels[row_index][start_index:end_index] = array("l", [number_id]) * (end_index - start_index)
+
+    def _remove_number(self, number_id: int) -> None:
+        row_index, start_index, end_index, value = self.numbers.pop(number_id)
+        if number_id in self.part_ids:
+            self.part_ids.remove(number_id)
+            self.part_total -= value
+        self.labels[row_index][start_index:end_index] = array("l", [-1]) * (end_index - start_index)
+
+    def _number_ids_in(self, first_row: int, last_row: int, first_col: int, last_col: int) -> Set[int]:
+        # Ids of numbers with a digit in rows [first_row, last_row) and columns [first_col, last_col)
+        number_ids = set()
+        for i in range(max(first_row, 0), min(last_row, len(self.rows))):
+            labels = self.labels[i]
+            for j in range(max(first_col, 0), min(last_col, len(labels))):
+                if labels[j] >= 0:
+                    number_ids.add(labels[j])
+        return number_ids
+
+    def _update_part(self, number_id: int) -> None:
+        row_index, start_index, end_index, value = self.numbers[number_id]
+        is_part = any(
+            char in self.symbols
+            for row in self.rows[max(row_index - 1, 0) : row_index + 2]
+            for char in row[max(start_index - 1, 0) : end_index + 1]
+        )
+
+        if is_part and number_id not in self.part_ids:
+            self.part_ids.add(number_id)
+            self.part_total += value
+        elif not is_part and number_id in self.part_ids:
+            self.part_ids.remove(number_id)
+            self.part_total -= value
+
+    def _update_gear(self, row_index: int, col_index: int) -> None:
+        self.gear_total -= self.gear_ratios.pop((row_index, col_index), 0)
+        if self.rows[row_index][col_index] != self.gear_symbol:
+            return
+
+        number_ids = self._number_ids_in(row_index - 1, row_index + 2, col_index - 1, col_index + 2)
+        # A gear touches exactly two numbers
+        if len(number_ids) == 2:
+            first_id, second_id = number_ids
+            ratio = self.numbers[first_id][3] * self.numbers[second_id][3]
+            self.gear_ratios[row_index, col_index] = ratio
+            self.gear_total += ratio
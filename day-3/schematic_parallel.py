@@ -0,0 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Container, List, Optional, Tuple
+
+from schematic_stream import confirm_row, label_row
+
+# Default number of anchor rows handed to each worker
+DEFAULT_BAND_HEIGHT = 256
+
+
+def process_band(
+    rows: List[str], has_top_halo: bool, has_bottom_halo: bool,
+    symbols: Optional[Container[str]], gear_symbol: Optional[str],
+) -> Tuple[int, int]:
+    # Sums parts and gears anchored in rows, not counting the halo rows themselves
+    labelled_rows = [label_row(row) for row in rows]
+    first_anchor = 1 if has_top_halo else 0
+    last_anchor = len(labelled_rows) - 1 if has_bottom_halo else len(labelled_rows)
+
+    part_sum, gear_sum = 0, 0
+    for i in range(first_anchor, last_anchor):
+        previous = labelled_rows[i - 1] if i > 0 else None
+        following = labelled_rows[i + 1] if i + 1 < len(labelled_rows) else None
+        for kind, value in confirm_row(previous, labelled_rows[i], following, symbols, gear_symbol):
+            if kind == "part":
+                part_sum += value
+            else:
+                gear_sum += value
+
+    return part_sum, gear_sum
+
+
+def sum_schematic_parallel(
+    engine_diagram: List[str], symbols: Optional[Container[str]], gear_symbol: Optional[str],
+    workers: Optional[int] = None, band_height: int = DEFAULT_BAND_HEIGHT,
+) -> Tuple[int, int]:
+    """Returns (sum of part numbers, sum of gear ratios) using a process pool.
+
+    The grid is cut into horizontal bands that each carry one halo row above
+    and below. A number or gear only counts in the band that owns its row,
+    so nothing is counted twice. workers=None uses every core.
+    """
+    height = len(engine_diagram)
+    bands, top_halos, bottom_halos = [], [], []
+    for start in range(0, height, band_height):
+        end = min(start + band_height, height)
+        bands.append(engine_diagram[max(start - 1, 0) : min(end + 1, height)])
+        top_halos.append(start > 0)
+        bottom_halos.append(end < height)
+
+    symbol_args = [symbols] * len(bands)
+    gear_args = [gear_symbol] * len(bands)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(process_band, bands, top_halos, bottom_halos, symbol_args, gear_args))
+
+    return sum(part for part, _ in results), sum(gear for _, gear in results)
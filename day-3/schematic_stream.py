@@ -0,0 +1,74 @@
+from array import array
+from collections import deque
+from itertools import chain
+from typing import Container, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from number_index import NUMBER_PATTERN
+
+
+class SchematicRow(NamedTuple):
+    text: str
+    # Index into numbers for every column, -1 where there is no digit
+    labels: array
+    # (value, start_index, end_index) with end_index exclusive
+    numbers: List[Tuple[int, int, int]]
+
+
+def label_row(row: str) -> SchematicRow:
+    text = row.rstrip("\r\n")
+    labels = array("l", [-1]) * len(text)
+    numbers = []
+    for match in NUMBER_PATTERN.finditer(text):
+        start_index, end_index = match.span()
+        labels[start_index:end_index] = array("l", [len(numbers)]) * (end_index - start_index)
+        numbers.append((int(match.group()), start_index, end_index))
+
+    return SchematicRow(text, labels, numbers)
+
+
+def confirm_row(
+    previous: Optional[SchematicRow],
+    current: SchematicRow,
+    following: Optional[SchematicRow],
+    symbols: Optional[Container[str]],
+    gear_symbol: Optional[str],
+) -> Iterator[Tuple[str, int]]:
+    neighbours = [row for row in (previous, current, following) if row is not None]
+
+    for value, start_index, end_index in current.numbers if symbols is not None else ():
+        left = max(start_index - 1, 0)
+        if any(char in symbols for row in neighbours for char in row.text[left : end_index + 1]):
+            yield "part", value
+
+    j = current.text.find(gear_symbol) if gear_symbol else -1
+    while j != -1:
+        adjacent_numbers = {}
+        for row_position, row in enumerate(neighbours):
+            for y in range(max(j - 1, 0), min(j + 2, len(row.text))):
+                number_id = row.labels[y]
+                if number_id >= 0:
+                    adjacent_numbers[row_position, number_id] = row.numbers[number_id][0]
+
+        # A gear touches exactly two numbers
+        if len(adjacent_numbers) == 2:
+            first, second = adjacent_numbers.values()
+            yield "gear", first * second
+        j = current.text.find(gear_symbol, j + 1)
+
+
+def stream_schematic(
+    rows: Iterable[str], symbols: Optional[Container[str]], gear_symbol: Optional[str]
+) -> Iterator[Tuple[str, int]]:
+    """Yields ("part", number) and ("gear", ratio) pairs from a stream of rows.
+
+    Passing None for symbols or gear_symbol skips that kind of result.
+    Adjacency never reaches past the previous and next row, so only a ring
+    buffer of three labelled rows is kept and each row is confirmed as soon
+    as the row after it has been read.
+    """
+    # None stands in for the missing rows above the first and below the last row
+    window = deque([None], maxlen=3)
+    for row in chain(map(label_row, rows), [None]):
+        window.append(row)
+        if len(window) == 3 and window[1] is not None:
+            yield from confirm_row(window[0], window[1], window[2], symbols, gear_symbol)
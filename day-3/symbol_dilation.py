@@ -0,0 +1,75 @@
+from typing import List
+
+import numpy as np
+
+# Longest digit run whose value always fits in an int64
+MAX_INT64_DIGITS = 18
+
+
+def schematic_array(engine_diagram: List[str]) -> np.ndarray:
+    # uint8 grid of the schematic, with short rows padded out with '.'
+    # Non-ASCII characters become '?', one byte each, so they stay symbols
+    rows = [row.rstrip("\r\n") for row in engine_diagram]
+    width = max((len(row) for row in rows), default=0)
+    data = "".join(row.ljust(width, ".") for row in rows).encode("ascii", errors="replace")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(rows), width)
+
+
+def sum_of_part_numbers_vectorized(engine_diagram: List[str]) -> int:
+    """Sums the part numbers with whole-array operations only.
+
+    Any byte that is neither a digit nor '.' counts as a symbol. The symbol
+    mask is dilated over its 3x3 neighbourhood and every digit run that
+    overlaps the dilated mask is a part number. Runs longer than
+    MAX_INT64_DIGITS would overflow the int64 place values, so those few are
+    converted with Python ints instead.
+    """
+    grid = schematic_array(engine_diagram)
+    height, width = grid.shape
+    if grid.size == 0:
+        return 0
+
+    is_digit = (grid >= ord("0")) & (grid <= ord("9"))
+    is_symbol = ~is_digit & (grid != ord("."))
+
+    # 3x3 dilation as the OR of the nine shifted views of a padded mask
+    padded = np.pad(is_symbol, 1)
+    near_symbol = np.zeros_like(is_symbol)
+    for dx in range(3):
+        for dy in range(3):
+            near_symbol |= padded[dx : dx + height, dy : dy + width]
+
+    # Everything below works on digit cells only, nothing wider than a byte per cell
+    digit_positions = np.flatnonzero(is_digit)
+    if len(digit_positions) == 0:
+        return 0
+    digit_values = grid.ravel()[digit_positions] - ord("0")
+
+    # A run starts after a gap in the digit positions or at the start of a row
+    is_run_start = np.ones(len(digit_positions), dtype=bool)
+    is_run_start[1:] = np.diff(digit_positions) != 1
+    is_run_start[1:] |= digit_positions[1:] % width == 0
+    run_starts = np.flatnonzero(is_run_start)
+    run_lengths = np.diff(run_starts, append=len(digit_positions))
+
+    # Place value of each digit is its distance to the end of its run, worked out in place
+    run_ids = np.cumsum(is_run_start)
+    run_ids -= 1
+    place_values = (run_starts + run_lengths - 1)[run_ids]
+    del run_ids
+    place_values -= np.arange(len(digit_positions))
+    np.power(10, place_values, out=place_values)
+    place_values *= digit_values
+    numbers = np.add.reduceat(place_values, run_starts)
+    del place_values
+
+    is_part = np.logical_or.reduceat(near_symbol.ravel()[digit_positions], run_starts)
+
+    # Summed as Python ints, many large part numbers can overflow an int64 total
+    is_long = run_lengths > MAX_INT64_DIGITS
+    total = int(numbers[is_part & ~is_long].astype(object).sum())
+    for run_id in np.flatnonzero(is_part & is_long):
+        start = run_starts[run_id]
+        total += int("".join(map(str, digit_values[start : start + run_lengths[run_id]])))
+
+    return total
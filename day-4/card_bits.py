@@ -0,0 +1,61 @@
+from itertools import chain, islice
+from typing import Iterable, Iterator, List
+
+import numpy as np
+
+# Number of cards turned into one pair of boolean matrices at a time
+DEFAULT_BATCH_SIZE = 65536
+
+
+def numbers_mask(numbers_str: str) -> int:
+    # Bit n is set when n is on the card, duplicates collapse like in a set
+    mask = 0
+    for number in numbers_str.split():
+        mask |= 1 << int(number)
+    return mask
+
+
+def count_matches(card_numbers: str) -> int:
+    # card_numbers is the part of a card after the ':'
+    winning_numbers_str, players_numbers_str = card_numbers.split("|")
+    return (numbers_mask(winning_numbers_str) & numbers_mask(players_numbers_str)).bit_count()
+
+
+def _parse_sides(sides: List[str]):
+    # Flat (row, number) pairs for one side of every card
+    tokens = [side.split() for side in sides]
+    numbers = np.array(list(chain.from_iterable(tokens)), dtype=np.int64)
+    rows = np.repeat(np.arange(len(sides)), [len(row) for row in tokens])
+    return rows, numbers
+
+
+def count_matches_batch(cards: List[str]) -> np.ndarray:
+    """Counts the matches of a batch of full card lines at once.
+
+    Each side becomes a row of a boolean matrix indexed by number, so the
+    matches of every card are a single AND and a row sum.
+    """
+    if not cards:
+        return np.zeros(0, dtype=np.int64)
+
+    winning_sides, players_sides = zip(*(card.split(":")[1].split("|") for card in cards))
+    winning_rows, winning_numbers = _parse_sides(winning_sides)
+    players_rows, players_numbers = _parse_sides(players_sides)
+    width = int(max(winning_numbers.max(initial=0), players_numbers.max(initial=0))) + 1
+
+    winning = np.zeros((len(cards), width), dtype=bool)
+    winning[winning_rows, winning_numbers] = True
+    players = np.zeros((len(cards), width), dtype=bool)
+    players[players_rows, players_numbers] = True
+
+    return (winning & players).sum(axis=1)
+
+
+def iter_match_counts(cards: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[int]:
+    # Streams match counts for any number of cards, one batch in memory at a time
+    cards = iter(cards)
+    while True:
+        batch = list(islice(cards, batch_size))
+        if not batch:
+            return
+        yield from count_matches_batch([card for card in batch if card.strip()]).tolist()
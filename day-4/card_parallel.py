@@ -0,0 +1,49 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Tuple
+
+from card_bits import iter_match_counts
+
+# Default number of bytes of the card file handed to each worker
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def find_chunk_boundaries(file_path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    # Same line aligned split as day-1/calibration_chunks.py, each day runs on its own
+    boundaries = []
+    with open(file_path, "rb") as f:
+        file_size = f.seek(0, 2)
+        f.seek(0)
+        while f.tell() < file_size:
+            start = f.tell()
+            f.seek(min(start + chunk_size, file_size))
+            f.readline()
+            boundaries.append((start, f.tell()))
+
+    return boundaries
+
+
+def count_matches_chunk(file_path: str, start: int, end: int) -> array:
+    # Parses the cards in [start, end) and returns one byte per card
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        cards = f.read(end - start).decode().splitlines()
+
+    return array("B", iter_match_counts(cards))
+
+
+def match_counts_parallel(
+    file_path: str, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> List[array]:
+    """Match counts of every card in the file, parsed in a process pool.
+
+    The returned arrays are in file order, one per line aligned chunk.
+    workers=None uses every core.
+    """
+    chunks = find_chunk_boundaries(file_path, chunk_size)
+    starts = [start for start, _ in chunks]
+    ends = [end for _, end in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(count_matches_chunk, repeat(file_path), starts, ends))
@@ -1,6 +1,8 @@
 from typing import List
 import os
 
+from card_bits import count_matches, iter_match_counts
+
 
 def readlines_from_file(file_path: str) -> List[str]:
     assert os.path.exists(file_path)
@@ -14,31 +16,20 @@ def readlines_from_file(file_path: str) -> List[str]:
     return lines
 
 
-def calculate_scratchcard(card: str) -> int:
-    points = 0
-
-    game_number, numbers_string = card.split(":")
-    winning_numbers_str, players_numbers_str = numbers_string.split("|")
-    # Convert the strings to sets of integers
-    winning_numbers = set(map(int, winning_numbers_str.split()))
-    players_numbers = set(map(int, players_numbers_str.split()))
-
-    # Find the intersection (matches) between the two sets
-    matches = winning_numbers.intersection(players_numbers)
-
-    if len(matches) == 1:
-        points = 1
+def points_for_matches(matches: int) -> int:
+    # One point for the first match, doubled for every match after it
+    return 1 << (matches - 1) if matches > 0 else 0
 
-    if len(matches) > 1:
-        points = 2 ** (len(matches) - 1)
 
-    return points
+def calculate_scratchcard(card: str) -> int:
+    game_number, numbers_string = card.split(":")
+    return points_for_matches(count_matches(numbers_string))
 
 
 def calculate_scratchcards(cards: List[str]) -> int:
     total_points = 0
-    for card in cards:
-        total_points += calculate_scratchcard(card)
+    for matches in iter_match_counts(cards):
+        total_points += points_for_matches(matches)
 
     return total_points
 
@@ -56,6 +47,7 @@ def test_example_data():
     result = calculate_scratchcards(example_data)
 
     assert result == 13
+    assert sum(calculate_scratchcard(card) for card in example_data) == 13
 
 
 if __name__ == "__main__":
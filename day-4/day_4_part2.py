@@ -1,5 +1,11 @@
-from typing import List
+from collections import deque
+from itertools import chain
+from typing import Iterable, List, Optional
 import os
+import tempfile
+
+from card_bits import count_matches, iter_match_counts
+from card_parallel import DEFAULT_CHUNK_SIZE, match_counts_parallel
 
 
 def readlines_from_file(file_path: str) -> List[str]:
@@ -15,43 +21,47 @@ def readlines_from_file(file_path: str) -> List[str]:
 
 
 def calculate_scratchcard_matches(card_numbers: str) -> int:
-    winning_numbers_str, players_numbers_str = card_numbers.split("|")
-    # Convert the strings to sets of integers
-    winning_numbers = set(map(int, winning_numbers_str.split()))
-    players_numbers = set(map(int, players_numbers_str.split()))
+    return count_matches(card_numbers)
+
 
-    # Find the intersection (matches) between the two sets
-    matches = winning_numbers.intersection(players_numbers)
+def count_scratchcard_copies(match_counts: Iterable[int]) -> int:
+    """Total number of cards held, given the match counts of cards in order.
 
-    return len(matches)
+    Won copies are kept as a difference array over the next cards, so only
+    a window as long as the largest match count is ever held in memory.
+    """
+    total_copies = 0
+    extra_copies = 0
+    # pending[k] is the change in extra copies when reaching the k-th next card
+    pending = deque()
 
+    for matches in match_counts:
+        if pending:
+            extra_copies += pending.popleft()
 
-def calculate_scratchcards_copies(cards: List[str]) -> int:
-    # gamenumber, matches
-    matches_per_card = {}
+        card_copies = 1 + extra_copies
+        total_copies += card_copies
 
-    # Populate matches_per_card with the number of matches for each card
-    for card in cards:
-        game_number_string, numbers_string = card.split(":")
-        # split()[0] necessary because game_number_string = "Game 12"
-        game_number = int(game_number_string.split()[1])
-        matches = calculate_scratchcard_matches(numbers_string)
-        matches_per_card[game_number] = matches
+        # Every copy of this card wins one copy of each of the next matches cards
+        if matches > 0:
+            while len(pending) <= matches:
+                pending.append(0)
+            pending[0] += card_copies
+            pending[matches] -= card_copies
 
-    # Initialize copies_per_card with 1 copy for each card
-    copies_per_card = {game_number: 1 for game_number in matches_per_card}
+    return total_copies
 
-    # Add extra copies for the matches
-    for game_number, matches in matches_per_card.items():
-        current_card_copies = copies_per_card[game_number]
-        for next_card in range(game_number + 1, game_number + matches + 1):
-            if next_card in copies_per_card:
-                copies_per_card[next_card] += current_card_copies
 
-    # Sum the total copies
-    total_copies = sum(copies_per_card.values())
+def calculate_scratchcards_copies(cards: Iterable[str]) -> int:
+    # Cards have to come in order, any iterable works so a file can be streamed
+    return count_scratchcard_copies(iter_match_counts(cards))
 
-    return total_copies
+
+def calculate_scratchcards_copies_parallel(
+    file_path: str, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    # Parsing runs in a process pool, only the copy pass is serial
+    return count_scratchcard_copies(chain.from_iterable(match_counts_parallel(file_path, workers, chunk_size)))
 
 
 def test_example_data():
@@ -67,6 +77,14 @@ def test_example_data():
     result = calculate_scratchcards_copies(example_data)
 
     assert result == 30
+    assert [calculate_scratchcard_matches(card.split(":")[1]) for card in example_data] == [4, 2, 2, 1, 0, 0]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "puzzle_input.txt")
+        with open(file_path, "w") as f:
+            f.write("\n".join(example_data))
+
+        assert calculate_scratchcards_copies_parallel(file_path, workers=2, chunk_size=64) == 30
 
 
 if __name__ == "__main__":
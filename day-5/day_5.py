@@ -1,6 +1,11 @@
-from typing import List
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import os
 
+import numpy as np
+
 
 def readlines_from_file(file_path: str) -> List[str]:
     assert os.path.exists(file_path)
@@ -14,18 +19,36 @@ def readlines_from_file(file_path: str) -> List[str]:
     return lines
 
 
+# Number of composed (source, target) maps kept per almanac
+COMPOSE_CACHE_SIZE = 64
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    # Sorts half-open ranges and joins the ones that overlap or touch
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
 class AlmanacData:
     def __init__(self):
         self.seeds = []
-        self.seed_to_soil = []
-        self.soil_to_fertilizer = []
-        self.fertilizer_to_water = []
-        self.water_to_light = []
-        self.light_to_temperature = []
-        self.temperature_to_humidity = []
-        self.humidity_to_location = []
+        # (source category, destination category) -> [(dest_start, src_start, length)]
+        self.maps: Dict[Tuple[str, str], list] = {}
+        # Sorted piece starts and offsets of each composed map, keyed by (source, target)
+        self._compose_cached = lru_cache(maxsize=COMPOSE_CACHE_SIZE)(self._compose)
+        # Composed pieces as (location start, location end, seed start), sorted by location
+        self._inverse_pieces: Optional[List[Tuple[int, int, int]]] = None
+        self._seed_ranges_cache: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
 
     def load_data(self, data: list):
+        self._compose_cached.cache_clear()
+        self._inverse_pieces = None
+        self._seed_ranges_cache = {}
         current_map = None
         for line in data:
             line = line.strip()
@@ -39,45 +62,192 @@ class AlmanacData:
                 current_map.append((dest_start, src_start, length))
 
     def _get_map_by_name(self, name: str):
-        return {
-            "seed-to-soil map": self.seed_to_soil,
-            "soil-to-fertilizer map": self.soil_to_fertilizer,
-            "fertilizer-to-water map": self.fertilizer_to_water,
-            "water-to-light map": self.water_to_light,
-            "light-to-temperature map": self.light_to_temperature,
-            "temperature-to-humidity map": self.temperature_to_humidity,
-            "humidity-to-location map": self.humidity_to_location,
-        }.get(name, None)
+        # "X-to-Y map" adds an edge from category X to category Y
+        source, _, target = name[: -len(" map")].partition("-to-")
+        if not source or not target:
+            return None
+        return self.maps.setdefault((source, target), [])
 
     def map_number(self, number: int, mapping: list) -> int:
         for dest_start, src_start, length in mapping:
             if src_start <= number < src_start + length:
                 return dest_start + (number - src_start)
-        assert 0
         return number  # Return the number itself if not in any range
 
+    def stages(self, source: str = "seed", target: str = "location") -> List[list]:
+        # Maps along the shortest chain of categories from source to target
+        previous: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue and target not in previous:
+            category = queue.popleft()
+            for map_source, map_target in self.maps:
+                if map_source == category and map_target not in previous:
+                    previous[map_target] = category
+                    queue.append(map_target)
+
+        assert target in previous, f"No maps lead from {source} to {target}"
+
+        stages = []
+        category = target
+        while previous[category] is not None:
+            stages.append(self.maps[previous[category], category])
+            category = previous[category]
+        return stages[::-1]
+
+    @staticmethod
+    def split_range(start: int, end: int, sorted_mapping: list) -> Iterator[Tuple[int, int, int]]:
+        # Yields (start, end, shift) pieces of [start, end), shift is 0 outside every entry
+        for dest_start, src_start, length in sorted_mapping:
+            src_end = src_start + length
+            if src_start >= end:
+                break
+            if src_end <= start:
+                continue
+
+            # The part before this entry is not mapped
+            if start < src_start:
+                yield start, src_start, 0
+                start = src_start
+
+            overlap_end = min(end, src_end)
+            yield start, overlap_end, dest_start - src_start
+            start = overlap_end
+            if start >= end:
+                return
+
+        if start < end:
+            yield start, end, 0
+
+    def map_ranges(self, ranges: List[Tuple[int, int]], mapping: list) -> List[Tuple[int, int]]:
+        """Maps half-open (start, end) ranges through one map.
+
+        Ranges are split at the map boundaries. Parts that fall outside every
+        map entry keep their values, and the result is merged back into as
+        few ranges as possible.
+        """
+        sorted_mapping = sorted(mapping, key=lambda entry: entry[1])
+        return merge_ranges([
+            (piece_start + shift, piece_end + shift)
+            for start, end in ranges
+            for piece_start, piece_end, shift in self.split_range(start, end, sorted_mapping)
+        ])
+
+    def compose(self, source: str = "seed", target: str = "location") -> Tuple[List[int], List[int]]:
+        """Composes the stages from source to target into one piecewise-linear map.
+
+        Returns the sorted source values where a piece starts and the offset
+        added to every value of that piece. The pieces cover every integer, so
+        a lookup is a single bisect. Results are kept in an LRU cache keyed by
+        (source, target) until load_data.
+        """
+        return self._compose_cached(source, target)
+
+    def _compose(self, source: str, target: str) -> Tuple[List[int], List[int]]:
+        # (start, end, offset), starting from the identity over everything
+        pieces = [(-(1 << 63), 1 << 63, 0)]
+        for mapping in self.stages(source, target):
+            sorted_mapping = sorted(mapping, key=lambda entry: entry[1])
+            pieces = [
+                (piece_start - offset, piece_end - offset, offset + shift)
+                for start, end, offset in pieces
+                for piece_start, piece_end, shift in self.split_range(start + offset, end + offset, sorted_mapping)
+            ]
+
+        starts, offsets = [], []
+        for start, _, offset in pieces:
+            # Neighbouring pieces with the same offset are one piece
+            if not offsets or offsets[-1] != offset:
+                starts.append(start)
+                offsets.append(offset)
+        return starts, offsets
+
+    def convert(
+        self, value_or_range: Union[int, Tuple[int, int]], source: str, target: str
+    ) -> Union[int, List[Tuple[int, int]]]:
+        # Maps a value, or a half-open (start, end) range, between any two categories
+        starts, offsets = self.compose(source, target)
+        if not isinstance(value_or_range, tuple):
+            # A single value, NumPy integers included
+            return value_or_range + offsets[bisect_right(starts, value_or_range) - 1]
+
+        start, end = value_or_range
+        ranges = []
+        piece = bisect_right(starts, start) - 1
+        while start < end:
+            piece_end = starts[piece + 1] if piece + 1 < len(starts) else end
+            stop = min(end, piece_end)
+            ranges.append((start + offsets[piece], stop + offsets[piece]))
+            start = stop
+            piece += 1
+        return merge_ranges(ranges)
+
+    def get_location_ranges(self, seed_ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        # Pushes whole seed ranges through every stage without enumerating seeds
+        ranges = seed_ranges
+        for mapping in self.stages():
+            ranges = self.map_ranges(ranges, mapping)
+        return ranges
+
     def get_location_for_seed(self, seed: int) -> int:
+        return self.convert(seed, "seed", "location")
+
+    def get_locations_for_seeds(self, seeds: np.ndarray) -> np.ndarray:
+        # Batch lookup, one searchsorted over the composed map for the whole array
+        starts, offsets = self.compose()
+        seeds = np.asarray(seeds, dtype=np.int64)
+        pieces = np.searchsorted(np.array(starts, dtype=np.int64), seeds, side="right") - 1
+        return seeds + np.array(offsets, dtype=np.int64)[pieces]
+
+    def get_seed_ranges_for_location_range(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Every seed whose location falls in [start, end), as sorted seed ranges.
+
+        Each piece of the composed map is inverted by subtracting its offset.
+        Several pieces may land on the same locations, so all of them are
+        checked. Results are cached per location range.
+        """
+        if (start, end) in self._seed_ranges_cache:
+            return self._seed_ranges_cache[start, end]
+
+        if self._inverse_pieces is None:
+            starts, offsets = self.compose()
+            ends = starts[1:] + [1 << 63]
+            self._inverse_pieces = sorted(
+                (piece_start + offset, piece_end + offset, piece_start)
+                for piece_start, piece_end, offset in zip(starts, ends, offsets)
+            )
+
+        seed_ranges = []
+        for location_start, location_end, seed_start in self._inverse_pieces:
+            if location_start >= end:
+                break
+            if location_end <= start:
+                continue
+            overlap_start = max(start, location_start)
+            overlap_end = min(end, location_end)
+            seed_ranges.append(
+                (seed_start + overlap_start - location_start, seed_start + overlap_end - location_start)
+            )
+
+        merged = merge_ranges(seed_ranges)
+
+        self._seed_ranges_cache[start, end] = merged
+        return merged
+
+    def get_location_for_seed_by_stage(self, seed: int) -> int:
         # Process through each stage
-        soil = self.map_number(seed, self.seed_to_soil)
-        fertilizer = self.map_number(soil, self.soil_to_fertilizer)
-        water = self.map_number(fertilizer, self.fertilizer_to_water)
-        light = self.map_number(water, self.water_to_light)
-        temperature = self.map_number(light, self.light_to_temperature)
-        humidity = self.map_number(temperature, self.temperature_to_humidity)
-        location = self.map_number(humidity, self.humidity_to_location)
-        return location
+        number = seed
+        for mapping in self.stages():
+            number = self.map_number(number, mapping)
+        return number
 
 
 def get_lowest_location_number(data: list) -> int:
     almanac = AlmanacData()
     almanac.load_data(data)
 
-    seed_locations = []
-    for seed in almanac.seeds:
-        location = almanac.get_location_for_seed(seed)
-        seed_locations.append(location)
+    seed_locations = almanac.get_locations_for_seeds(np.array(almanac.seeds, dtype=np.int64))
 
-    return min(seed_locations)
+    return int(seed_locations.min())
 
     # Implementation of processing seeds to find the lowest location number
     # ...
@@ -124,6 +294,29 @@ def test_example_data():
 
     assert result == 35
 
+    almanac = AlmanacData()
+    almanac.load_data(example_data)
+    for seed in range(200):
+        assert almanac.get_location_for_seed(seed) == almanac.get_location_for_seed_by_stage(seed)
+
+    seed_locations = almanac.get_locations_for_seeds(np.arange(200))
+    assert seed_locations.tolist() == [almanac.get_location_for_seed(seed) for seed in range(200)]
+
+    # Seeds taken from a NumPy array are NumPy integers, not ints
+    assert almanac.get_location_for_seed(np.int64(79)) == almanac.get_location_for_seed(79) == 82
+
+    # Seed 79 goes through soil 81 and humidity 78 to location 82
+    assert almanac.convert(81, "soil", "humidity") == 78
+    assert almanac.convert((79, 80), "seed", "location") == [(82, 83)]
+    almanac.load_data(["location-to-zone map:", "0 80 10"])
+    assert almanac.convert(79, "seed", "zone") == 2
+
+    # The inverse query agrees with a forward scan over the first 100 seeds
+    seed_ranges = almanac.get_seed_ranges_for_location_range(0, 47)
+    assert [seed for seed in range(100) if almanac.get_location_for_seed(seed) < 47] == [
+        seed for start, end in seed_ranges for seed in range(max(start, 0), min(end, 100))
+    ]
+
 
 if __name__ == "__main__":
     test_example_data()
@@ -0,0 +1,72 @@
+import os
+
+from day_5 import AlmanacData, readlines_from_file
+
+
+def get_lowest_location_number(data: list) -> int:
+    almanac = AlmanacData()
+    almanac.load_data(data)
+
+    # The seeds line now holds pairs of (range start, range length)
+    seed_ranges = [
+        (start, start + length)
+        for start, length in zip(almanac.seeds[::2], almanac.seeds[1::2])
+    ]
+
+    location_ranges = almanac.get_location_ranges(seed_ranges)
+
+    return min(start for start, _ in location_ranges)
+
+
+def test_example_data():
+    example_data = [
+        "seeds: 79 14 55 13",
+        "",
+        "seed-to-soil map:",
+        "50 98 2",
+        "52 50 48",
+        "",
+        "soil-to-fertilizer map:",
+        "0 15 37",
+        "37 52 2",
+        "39 0 15",
+        "",
+        "fertilizer-to-water map:",
+        "49 53 8",
+        "0 11 42",
+        "42 0 7",
+        "57 7 4",
+        "",
+        "water-to-light map:",
+        "88 18 7",
+        "18 25 70",
+        "",
+        "light-to-temperature map:",
+        "45 77 23",
+        "81 45 19",
+        "68 64 13",
+        "",
+        "temperature-to-humidity map:",
+        "0 69 1",
+        "1 0 69",
+        "",
+        "humidity-to-location map:",
+        "60 56 37",
+        "56 93 4",
+    ]
+
+    result = get_lowest_location_number(example_data)
+
+    assert result == 46
+
+
+if __name__ == "__main__":
+    test_example_data()
+
+    py_file_path = os.path.dirname(__file__)
+    puzzle_doc_path = os.path.join(py_file_path, "puzzle_input.txt")
+
+    puzzle_lines = readlines_from_file(puzzle_doc_path)
+
+    result = get_lowest_location_number(puzzle_lines)
+    print(result)